@@ -0,0 +1,16 @@
+import os
+import sys
+
+# WSGI entry point for load tests: the real app with Gemini replaced by the
+# offline fake. Run with `gunicorn -c gunicorn.conf.py benchmarks.fake_app:app`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'offline-benchmark')
+os.environ.setdefault('GEMINI_TRANSPORT', 'rest')
+# Load tests drive every request from one address. Under gunicorn.conf.py
+# main is imported by post_fork first, so load.py also sets this for the server.
+os.environ.setdefault('RATE_LIMIT_PER_MINUTE', '0')
+
+from benchmarks.fake_gemini import FakeGemini
+from main import app
+
+fake_gemini = FakeGemini().install()
@@ -0,0 +1,82 @@
+import os
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+# Offline stand-in for GenerativeModel.generate_content. Latency is a
+# lognormal time-to-first-token plus output tokens at a fixed token rate.
+SAMPLE_RESPONSE_PATH = os.path.join(os.path.dirname(__file__), 'sample_response.json')
+
+DEFAULT_CONFIG = {
+    'first_token_ms': float(os.getenv('FAKE_GEMINI_FIRST_TOKEN_MS', 400)),
+    'latency_sigma': float(os.getenv('FAKE_GEMINI_LATENCY_SIGMA', 0.4)),
+    'tokens_per_second': float(os.getenv('FAKE_GEMINI_TOKENS_PER_SECOND', 250)),
+    'error_rate': float(os.getenv('FAKE_GEMINI_ERROR_RATE', 0)),
+    'rate_limit_rate': float(os.getenv('FAKE_GEMINI_RATE_LIMIT_RATE', 0)),
+    'chunk_tokens': int(os.getenv('FAKE_GEMINI_CHUNK_TOKENS', 20)),
+}
+
+class FakeCandidate:
+    def __init__(self, token_count: int):
+        self.token_count = token_count
+
+class FakeResponse:
+    def __init__(self, text: str, token_count: int):
+        self.text = text
+        self.candidates = [FakeCandidate(token_count)]
+
+class FakeGemini:
+    def __init__(self, config: Optional[Dict] = None, responses: Optional[List[str]] = None):
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        if responses is None:
+            with open(SAMPLE_RESPONSE_PATH, encoding='utf-8') as f:
+                responses = [json.dumps(json.load(f), ensure_ascii=False, indent=2)]
+        self.responses = responses
+        self.calls = 0
+        self.errors = 0
+        self._original = None
+
+    def install(self) -> 'FakeGemini':
+        fake = self
+        self._original = genai.GenerativeModel.generate_content
+        
+        def generate_content(model, contents, *, generation_config=None, safety_settings=None, stream=False, **kwargs):
+            return fake.generate(stream)
+        
+        genai.GenerativeModel.generate_content = generate_content
+        return self
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            genai.GenerativeModel.generate_content = self._original
+            self._original = None
+
+    def generate(self, stream: bool):
+        self.calls += 1
+        config = self.config
+        time.sleep(random.lognormvariate(0, config['latency_sigma']) * config['first_token_ms'] / 1000)
+        
+        roll = random.random()
+        if roll < config['rate_limit_rate']:
+            self.errors += 1
+            raise google_exceptions.TooManyRequests('Fake quota exceeded')
+        if roll < config['rate_limit_rate'] + config['error_rate']:
+            self.errors += 1
+            raise google_exceptions.ServiceUnavailable('Fake upstream unavailable')
+        
+        text = random.choice(self.responses)
+        tokens = max(1, len(text.encode('utf-8')) // 4)
+        if stream:
+            return self.stream(text, tokens)
+        time.sleep(tokens / config['tokens_per_second'])
+        return FakeResponse(text, tokens)
+
+    def stream(self, text: str, tokens: int):
+        chunk_chars = max(1, len(text) * self.config['chunk_tokens'] // tokens)
+        for start in range(0, len(text), chunk_chars):
+            time.sleep(self.config['chunk_tokens'] / self.config['tokens_per_second'])
+            yield FakeResponse(text[start:start + chunk_chars], self.config['chunk_tokens'])
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# States, districts and soils are read from the app tables so the request mix
+# matches real form submissions.
+os.environ.setdefault('GEMINI_API_KEY', 'offline-benchmark')
+from main import agronomy
+
+def build_inputs(unique: int, seed: int) -> list:
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(unique):
+        state = rng.choice(list(agronomy.states))
+        info = agronomy.states[state]
+        inputs.append({
+            'state': state,
+            'district': rng.choice(info['districts']),
+            'soil_type': rng.choice(info['soil_types']),
+            'season': rng.choice(list(agronomy.seasons)),
+            'language': rng.choice(['english', agronomy.state_language_map.get(state, 'english')]),
+            'farm_size': str(rng.choice([1, 2, 5, 10]))
+        })
+    return inputs
+
+def send(url: str, form: dict, timeout: float) -> tuple:
+    body = urllib.parse.urlencode(form).encode('utf-8')
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body), timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 'error'
+    return time.perf_counter() - started, status
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def start_server(port: int, workers: int, threads: int) -> subprocess.Popen:
+    # gunicorn's post_fork imports main before fake_app runs, so settings
+    # that main reads at import must be in the server's environment.
+    # Every load-test request comes from one address, so the client limiter is off.
+    env = dict(os.environ, PORT=str(port), GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads), GEMINI_TRANSPORT='rest', RATE_LIMIT_PER_MINUTE='0')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'benchmarks.fake_app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+            return server
+        except Exception:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start within 30 seconds')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='End-to-end load test for /recommend against the offline Gemini fake.')
+    parser.add_argument('--url', help='Target an already running server instead of starting gunicorn')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--unique', type=int, default=500, help='Distinct inputs; fewer than --requests exercises the cache')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=128)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    
+    server = None if args.url else start_server(args.port, args.workers, args.threads)
+    base_url = args.url or f'http://127.0.0.1:{args.port}'
+    inputs = build_inputs(args.unique, args.seed)
+    forms = [inputs[i % len(inputs)] for i in range(args.requests)]
+    
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda form: send(f'{base_url}/recommend', form, args.timeout), forms))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    
+    latencies = [latency for latency, _ in results]
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    print(json.dumps({
+        'requests': len(results),
+        'concurrency': args.concurrency,
+        'seconds': round(elapsed, 2),
+        'requests_per_second': round(len(results) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'statuses': statuses
+    }, indent=2))
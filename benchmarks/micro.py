@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'offline-benchmark')
+
+from benchmarks.fake_gemini import SAMPLE_RESPONSE_PATH
+import main
+
+FORM = {
+    'state': 'Tamil Nadu',
+    'district': 'Madurai',
+    'soil_type': 'red',
+    'season': 'kharif',
+    'farm_size': '2.5',
+    'irrigation': 'partial',
+    'budget': '50000',
+    'previous_crop': 'rice',
+    'language': 'tamil'
+}
+
+def build_cases() -> dict:
+    state_info = main.agronomy.states[FORM['state']]
+    rule_suggestions = main.get_rule_based_suggestions(FORM, state_info)
+    with open(SAMPLE_RESPONSE_PATH, encoding='utf-8') as f:
+        sample = f.read()
+    wrapped = f'```json\n{sample}\n```'
+    batch_rows = [
+        {'state': state, 'district': info['districts'][0], 'soil_type': soil, 'season': season}
+        for state, info in main.agronomy.states.items()
+        for soil in main.agronomy.soils
+        for season in main.agronomy.seasons
+    ]
+    client = main.app.test_client()
+    recommend_payload = {
+        'success': True,
+        'ai_recommendation': main.parse_ai_response(sample),
+        'rule_suggestions': rule_suggestions,
+        'state_info': state_info,
+        'language': FORM['language'],
+    }
+    compact_shape = main.parse_response_shape({'compact': '1', 'fields': 'success,state,ai_recommendation.recommended_crops(name,benefits)'})
+    
+    return {
+        'get_rule_based_suggestions': lambda: main.get_rule_based_suggestions(FORM, state_info),
+        'get_rule_based_suggestions_batch[1000]': lambda: main.get_rule_based_suggestions_batch(batch_rows[:1000]),
+        'build_enhanced_prompt': lambda: main.build_enhanced_prompt(FORM, state_info, rule_suggestions, FORM['language']),
+        'parse_ai_response': lambda: main.parse_ai_response(wrapped),
+        'states_serialize': lambda: main.encode_json(main.build_states_data(main.agronomy)),
+        'recommend_serialize_stdlib': lambda: json.dumps(recommend_payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+        'recommend_serialize': lambda: main.app.json.dump_bytes(recommend_payload),
+        'recommend_serialize_compact': lambda: main.app.json.dump_bytes(main.shape_response(recommend_payload, FORM['state'], compact_shape)),
+        'resolve_district': lambda: main.resolve_district('Karnataka', 'Bangalore'),
+        'resolve_district_fuzzy': lambda: main.resolve_district('Tamil Nadu', 'Tiruchirapalli'),
+        'autocomplete_places': lambda: main.autocomplete_places('ban'),
+        'states_request': lambda: client.get('/states', headers={'Accept-Encoding': 'gzip'}),
+    }
+
+def run(names: list, repeat: int, min_time: float) -> dict:
+    results = {}
+    for name, case in build_cases().items():
+        if names and name not in names:
+            continue
+        timer = timeit.Timer(case)
+        number, _ = timer.autorange()
+        number = max(number, int(number * min_time / 0.2))
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        results[name] = best * 1e6
+        print(f'{name:45s} {best * 1e6:12.2f} us/op')
+    return results
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    ok = True
+    for name, micros in results.items():
+        if name not in baseline:
+            continue
+        change = micros / baseline[name] - 1
+        flag = 'REGRESSION' if change > tolerance else ''
+        ok = ok and not flag
+        print(f'{name:45s} {change * 100:+8.1f}% {flag}')
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Microbenchmarks for the request hot path (offline).')
+    parser.add_argument('names', nargs='*', help='Only run these benchmarks')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds per repeat')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare against a saved JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before failing --compare')
+    args = parser.parse_args()
+    
+    main.logger.setLevel('WARNING')
+    results = run(args.names, args.repeat, args.min_time)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV = dict(os.environ, GEMINI_API_KEY=os.getenv('GEMINI_API_KEY', 'offline-benchmark'), PYTHONPATH=ROOT)
+
+# Imports the app and serves /health in-process, then prints the wall-clock
+# time so the parent can measure spawn-to-first-response.
+FIRST_REQUEST = (
+    'import time, main\n'
+    'main.app.test_client().get("/health")\n'
+    'print(time.time())\n'
+)
+
+def import_report(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, env=ENV, capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules.append((name, int(self_us), int(cumulative_us)))
+
+    total = next(cumulative for name, _, cumulative in modules if name == 'main')
+    packages = {}
+    for name, self_us, _ in modules:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    print(f'import main: {total / 1000:.1f} ms ({len(modules)} modules)')
+    print('\nSlowest packages (self time):')
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f'  {package:40s} {self_us / 1000:8.1f} ms')
+    print('\nSlowest modules (self time):')
+    for name, self_us, _ in sorted(modules, key=lambda item: -item[1])[:top]:
+        print(f'  {name:40s} {self_us / 1000:8.1f} ms')
+
+def cold_start(runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.time()
+        output = subprocess.run([sys.executable, '-c', FIRST_REQUEST], cwd=ROOT, env=ENV, capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]) - started)
+    return timings
+
+def gunicorn_start(port: int) -> float:
+    env = dict(ENV, PORT=str(port), GUNICORN_WORKERS='1')
+    started = time.time()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'main:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.time() - started < 30:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+                return time.time() - started
+            except Exception:
+                time.sleep(0.01)
+        raise RuntimeError('gunicorn did not start within 30 seconds')
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import-time profile and cold-start benchmark (offline).')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts to time')
+    parser.add_argument('--top', type=int, default=10, help='Entries per import-time table')
+    parser.add_argument('--gunicorn', action='store_true', help='Also time gunicorn boot to the first /health response')
+    parser.add_argument('--port', type=int, default=5098)
+    args = parser.parse_args()
+
+    import_report(args.top)
+    timings = cold_start(args.runs)
+    print(f'\nCold start to first request (in-process, {args.runs} runs): '
+          f'median {statistics.median(timings) * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms')
+    if args.gunicorn:
+        print(f'gunicorn boot to first /health: {gunicorn_start(args.port) * 1000:.0f} ms')
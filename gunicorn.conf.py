@@ -0,0 +1,19 @@
+import os
+
+# Slow Gemini calls are I/O bound, so each worker serves many requests on
+# threads instead of holding a whole process per in-flight recommendation.
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 128))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+
+def post_fork(server, worker):
+    # Build the Gemini clients after forking; gRPC channels must not be
+    # shared across processes. Warm-up runs in the background so the worker
+    # starts serving at once. Job worker threads are started per worker too.
+    from main import gemini_pool, job_queue, GEMINI_CONNECT_TIMEOUT
+    gemini_pool.warm_up_in_background(GEMINI_CONNECT_TIMEOUT)
+    job_queue.start()
@@ -1,11 +1,45 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 import json
 from dotenv import load_dotenv
-import google.generativeai as genai
 from typing import Dict, List, Optional
 import logging
+import hashlib
+import gzip
+import sqlite3
+import threading
+import time
+import itertools
+import csv
+import io
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import random
+from contextlib import contextmanager
+from collections import OrderedDict
+from urllib.parse import quote
+import bisect
+import re
+import math
+import unicodedata
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,406 +50,1493 @@ load_dotenv()
 GEMINI_KEY = os.getenv('GEMINI_API_KEY')
 
 # Initialize Gemini
-genai.configure(api_key=GEMINI_KEY)
+GEMINI_TRANSPORT = os.getenv('GEMINI_TRANSPORT', 'grpc')
+GEMINI_POOL_SIZE = int(os.getenv('GEMINI_POOL_SIZE', 4))
+GEMINI_CONNECT_TIMEOUT = float(os.getenv('GEMINI_CONNECT_TIMEOUT', 5))
+
+# The Gemini SDK and its gRPC/protobuf stack dominate import time, so they are
+# imported and configured on first AI use (or by the post-fork warm-up thread).
+genai = None
+glm = None
+gemini_sdk_lock = threading.Lock()
+
+def load_gemini_sdk() -> tuple:
+    global genai, glm
+    if genai is None:
+        with gemini_sdk_lock:
+            if genai is None:
+                import google.generativeai as sdk
+                import google.ai.generativelanguage as sdk_types
+                sdk.configure(api_key=GEMINI_KEY, transport=GEMINI_TRANSPORT)
+                # Ask for a bare JSON body when the installed SDK supports JSON response mode
+                if 'response_mime_type' in sdk_types.GenerationConfig.meta.fields:
+                    GENERATION_CONFIG['response_mime_type'] = 'application/json'
+                glm = sdk_types
+                genai = sdk
+    return genai, glm
+
+# JSON serialization: orjson when installed, stdlib otherwise. Output is
+# compact UTF-8 with keys in insertion order. Clients that prefer
+# application/x-msgpack get MessagePack when msgpack is installed.
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+    ensure_ascii = False
+    compact = True
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            kwargs.setdefault('separators', (',', ':'))
+            return json.dumps(obj, **kwargs)
+        return self.dump_bytes(obj).decode('utf-8')
+
+    def dump_bytes(self, obj) -> bytes:
+        if orjson is None:
+            return self.dumps(obj).encode('utf-8')
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if msgpack is not None and wants_msgpack():
+            response = self._app.response_class(
+                msgpack.packb(obj, default=self.default), mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = self._app.response_class(self.dump_bytes(obj), mimetype=self.mimetype)
+        response.vary.add('Accept')
+        return response
+
+def wants_msgpack() -> bool:
+    if not has_request_context():
+        return False
+    best = request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
 
 # Flask app
-app = Flask(__name__, template_folder="src")
+app = Flask(__name__)
 CORS(app)
-app.config['JSON_SORT_KEYS'] = False
-
-# Language mappings for states
-STATE_LANGUAGE_MAP = {
-    'Tamil Nadu': 'tamil',
-    'Karnataka': 'kannada',
-    'Kerala': 'malayalam',
-    'Andhra Pradesh': 'telugu',
-    'Telangana': 'telugu',
-    'Maharashtra': 'marathi',
-    'Gujarat': 'gujarati',
-    'Punjab': 'punjabi',
-    'West Bengal': 'bengali',
-    'Rajasthan': 'hindi',
-    'Uttar Pradesh': 'hindi',
-    'Bihar': 'hindi',
-    'Madhya Pradesh': 'hindi',
-    'Haryana': 'hindi',
-    'Jharkhand': 'hindi',
-    'Chhattisgarh': 'hindi',
-    'Uttarakhand': 'hindi',
-    'Himachal Pradesh': 'hindi',
-    'Delhi': 'hindi',
-    'Jammu and Kashmir': 'hindi',
-    'Assam': 'assamese',
-    'Odisha': 'odia',
-    'Goa': 'konkani',
-    'Arunachal Pradesh': 'english',
-    'Manipur': 'english',
-    'Meghalaya': 'english',
-    'Mizoram': 'english',
-    'Nagaland': 'english',
-    'Sikkim': 'english',
-    'Tripura': 'bengali',
-    'Ladakh': 'hindi',
+app.json = FastJSONProvider(app)
+
+# Gemini generation settings
+GEMINI_MODEL_NAME = 'gemini-2.0-flash-exp'
+GENERATION_CONFIG = {
+    'temperature': 0.7,
+    'top_p': 0.95,
+    'top_k': 40,
+    'max_output_tokens': 4096,
 }
 
-# Language display names
-LANGUAGES = {
-    'english': {'name': 'English', 'native': 'English'},
-    'hindi': {'name': 'Hindi', 'native': 'हिंदी'},
-    'tamil': {'name': 'Tamil', 'native': 'தமிழ்'},
-    'telugu': {'name': 'Telugu', 'native': 'తెలుగు'},
-    'kannada': {'name': 'Kannada', 'native': 'ಕನ್ನಡ'},
-    'malayalam': {'name': 'Malayalam', 'native': 'മലയാളം'},
-    'marathi': {'name': 'Marathi', 'native': 'मराठी'},
-    'bengali': {'name': 'Bengali', 'native': 'বাংলা'},
-    'gujarati': {'name': 'Gujarati', 'native': 'ગુજરાતી'},
-    'punjabi': {'name': 'Punjabi', 'native': 'ਪੰਜਾਬੀ'},
-    'odia': {'name': 'Odia', 'native': 'ଓଡ଼ିଆ'},
-    'assamese': {'name': 'Assamese', 'native': 'অসমীয়া'},
-    'konkani': {'name': 'Konkani', 'native': 'कोंकणी'},
+# Output token budget derived from the number of crops requested
+DEFAULT_CROP_COUNT = 5
+TOKENS_PER_CROP = int(os.getenv('TOKENS_PER_CROP', 700))
+TOKENS_OVERHEAD = int(os.getenv('TOKENS_OVERHEAD', 150))
+# Indic scripts take roughly twice as many tokens as English for the same text
+NON_ENGLISH_TOKEN_FACTOR = float(os.getenv('NON_ENGLISH_TOKEN_FACTOR', 2))
+
+# Invariant part of the recommendation prompt, compiled once
+RECOMMENDATION_SCHEMA = {
+    'recommended_crops': [{
+        'name': 'Crop Name',
+        'climate_suitability': 'why it suits the climate',
+        'water_requirement': 'water needs, e.g. 600-800mm, irrigation frequency',
+        'growth_cycle': {
+            'duration': 'sowing to harvest',
+            'stages': 'key growth stages and durations',
+            'critical_periods': 'when the crop needs most attention'
+        },
+        'benefits': {
+            'yield_potential': 'expected yield per acre',
+            'market_demand': 'current market situation',
+            'profitability': 'income potential and ROI',
+            'nutritional_value': 'if applicable',
+            'other_benefits': 'soil improvement, short duration, etc.'
+        },
+        'cultivation_practices': {
+            'sowing_time': 'best time to sow',
+            'seed_rate': 'seeds needed per acre',
+            'spacing': 'row to row and plant to plant distance',
+            'fertilizers': 'NPK requirements and application schedule',
+            'pest_diseases': 'common issues and prevention'
+        }
+    }]
 }
+# Compiled from the schema: top-level crop fields mapped to their sub-fields
+# (None for plain string fields)
+CROP_FIELDS = {
+    field: list(value) if isinstance(value, dict) else None
+    for field, value in RECOMMENDATION_SCHEMA['recommended_crops'][0].items()
+}
+RECOMMENDATION_INSTRUCTIONS = (
+    'You are an agricultural expert specializing in Indian farming practices. '
+    'Recommend crops for the farm below. Respond ONLY with valid JSON in exactly this structure, no additional text:\n'
+    + json.dumps(RECOMMENDATION_SCHEMA, separators=(',', ':'))
+)
 
-# Complete Indian States with Districts - ALL 31 States and UTs
-INDIAN_STATES_DISTRICTS = {
-    'Andhra Pradesh': {
-        'climate': 'Tropical, hot and humid',
-        'major_crops': ['rice', 'cotton', 'sugarcane', 'tobacco', 'pulses'],
-        'soil_types': ['red', 'black', 'alluvial'],
-        'rainfall': '900-1200mm',
-        'districts': ['Anantapur', 'Chittoor', 'East Godavari', 'Guntur', 'Krishna', 'Kurnool', 'Prakasam', 'Srikakulam', 'Visakhapatnam', 'Vizianagaram', 'West Godavari', 'YSR Kadapa', 'Nellore']
-    },
-    'Arunachal Pradesh': {
-        'climate': 'Subtropical to alpine',
-        'major_crops': ['rice', 'maize', 'millet', 'wheat', 'pulses'],
-        'soil_types': ['alluvial', 'red'],
-        'rainfall': '2000-4000mm',
-        'districts': ['Tawang', 'West Kameng', 'East Kameng', 'Papum Pare', 'Kurung Kumey', 'Kra Daadi', 'Lower Subansiri', 'Upper Subansiri', 'West Siang', 'East Siang', 'Siang', 'Upper Siang', 'Lower Siang', 'Lower Dibang Valley', 'Dibang Valley', 'Anjaw', 'Lohit', 'Namsai', 'Changlang', 'Tirap', 'Longding']
-    },
-    'Assam': {
-        'climate': 'Subtropical with high rainfall',
-        'major_crops': ['rice', 'tea', 'jute', 'pulses', 'oilseeds'],
-        'soil_types': ['alluvial', 'red'],
-        'rainfall': '2000-3000mm',
-        'districts': ['Baksa', 'Barpeta', 'Biswanath', 'Bongaigaon', 'Cachar', 'Charaideo', 'Chirang', 'Darrang', 'Dhemaji', 'Dhubri', 'Dibrugarh', 'Dima Hasao', 'Goalpara', 'Golaghat', 'Hailakandi', 'Hojai', 'Jorhat', 'Kamrup', 'Kamrup Metropolitan', 'Karbi Anglong', 'Karimganj', 'Kokrajhar', 'Lakhimpur', 'Majuli', 'Morigaon', 'Nagaon', 'Nalbari', 'Sivasagar', 'Sonitpur', 'South Salmara-Mankachar', 'Tinsukia', 'Udalguri', 'West Karbi Anglong']
-    },
-    'Bihar': {
-        'climate': 'Subtropical',
-        'major_crops': ['rice', 'wheat', 'maize', 'pulses', 'sugarcane'],
-        'soil_types': ['alluvial'],
-        'rainfall': '1000-1400mm',
-        'districts': ['Araria', 'Arwal', 'Aurangabad', 'Banka', 'Begusarai', 'Bhagalpur', 'Bhojpur', 'Buxar', 'Darbhanga', 'East Champaran', 'Gaya', 'Gopalganj', 'Jamui', 'Jehanabad', 'Kaimur', 'Katihar', 'Khagaria', 'Kishanganj', 'Lakhisarai', 'Madhepura', 'Madhubani', 'Munger', 'Muzaffarpur', 'Nalanda', 'Nawada', 'Patna', 'Purnia', 'Rohtas', 'Saharsa', 'Samastipur', 'Saran', 'Sheikhpura', 'Sheohar', 'Sitamarhi', 'Siwan', 'Supaul', 'Vaishali', 'West Champaran']
-    },
-    'Chhattisgarh': {
-        'climate': 'Tropical',
-        'major_crops': ['rice', 'maize', 'pulses', 'oilseeds', 'sugarcane'],
-        'soil_types': ['red', 'black'],
-        'rainfall': '1200-1600mm',
-        'districts': ['Balod', 'Baloda Bazar', 'Balrampur', 'Bastar', 'Bemetara', 'Bijapur', 'Bilaspur', 'Dantewada', 'Dhamtari', 'Durg', 'Gariaband', 'Janjgir-Champa', 'Jashpur', 'Kabirdham', 'Kanker', 'Kondagaon', 'Korba', 'Koriya', 'Mahasamund', 'Mungeli', 'Narayanpur', 'Raigarh', 'Raipur', 'Rajnandgaon', 'Sukma', 'Surajpur', 'Surguja']
-    },
-    'Goa': {
-        'climate': 'Tropical coastal',
-        'major_crops': ['rice', 'cashew', 'coconut', 'areca nut', 'vegetables'],
-        'soil_types': ['laterite', 'alluvial'],
-        'rainfall': '2500-3000mm',
-        'districts': ['North Goa', 'South Goa']
-    },
-    'Gujarat': {
-        'climate': 'Semi-arid to arid',
-        'major_crops': ['cotton', 'groundnut', 'tobacco', 'wheat', 'bajra'],
-        'soil_types': ['black', 'alluvial', 'sandy'],
-        'rainfall': '400-1000mm',
-        'districts': ['Ahmedabad', 'Amreli', 'Anand', 'Aravalli', 'Banaskantha', 'Bharuch', 'Bhavnagar', 'Botad', 'Chhota Udaipur', 'Dahod', 'Dang', 'Devbhoomi Dwarka', 'Gandhinagar', 'Gir Somnath', 'Jamnagar', 'Junagadh', 'Kheda', 'Kutch', 'Mahisagar', 'Mehsana', 'Morbi', 'Narmada', 'Navsari', 'Panchmahal', 'Patan', 'Porbandar', 'Rajkot', 'Sabarkantha', 'Surat', 'Surendranagar', 'Tapi', 'Vadodara', 'Valsad']
-    },
-    'Haryana': {
-        'climate': 'Semi-arid',
-        'major_crops': ['wheat', 'rice', 'sugarcane', 'cotton', 'bajra'],
-        'soil_types': ['alluvial', 'sandy'],
-        'rainfall': '400-600mm',
-        'districts': ['Ambala', 'Bhiwani', 'Charkhi Dadri', 'Faridabad', 'Fatehabad', 'Gurugram', 'Hisar', 'Jhajjar', 'Jind', 'Kaithal', 'Karnal', 'Kurukshetra', 'Mahendragarh', 'Nuh', 'Palwal', 'Panchkula', 'Panipat', 'Rewari', 'Rohtak', 'Sirsa', 'Sonipat', 'Yamunanagar']
-    },
-    'Himachal Pradesh': {
-        'climate': 'Temperate to alpine',
-        'major_crops': ['wheat', 'maize', 'rice', 'barley', 'apples'],
-        'soil_types': ['alluvial', 'mountain'],
-        'rainfall': '1000-2000mm',
-        'districts': ['Bilaspur', 'Chamba', 'Hamirpur', 'Kangra', 'Kinnaur', 'Kullu', 'Lahaul and Spiti', 'Mandi', 'Shimla', 'Sirmaur', 'Solan', 'Una']
-    },
-    'Jharkhand': {
-        'climate': 'Tropical to subtropical',
-        'major_crops': ['rice', 'maize', 'pulses', 'oilseeds', 'vegetables'],
-        'soil_types': ['red', 'laterite'],
-        'rainfall': '1200-1600mm',
-        'districts': ['Bokaro', 'Chatra', 'Deoghar', 'Dhanbad', 'Dumka', 'East Singhbhum', 'Garhwa', 'Giridih', 'Godda', 'Gumla', 'Hazaribagh', 'Jamtara', 'Khunti', 'Koderma', 'Latehar', 'Lohardaga', 'Pakur', 'Palamu', 'Ramgarh', 'Ranchi', 'Sahibganj', 'Seraikela-Kharsawan', 'Simdega', 'West Singhbhum']
-    },
-    'Karnataka': {
-        'climate': 'Tropical to semi-arid',
-        'major_crops': ['rice', 'ragi', 'jowar', 'cotton', 'sugarcane'],
-        'soil_types': ['red', 'black', 'laterite'],
-        'rainfall': '600-3000mm',
-        'districts': ['Bagalkot', 'Ballari', 'Belagavi', 'Bengaluru Rural', 'Bengaluru Urban', 'Bidar', 'Chamarajanagar', 'Chikkaballapur', 'Chikkamagaluru', 'Chitradurga', 'Dakshina Kannada', 'Davanagere', 'Dharwad', 'Gadag', 'Hassan', 'Haveri', 'Kalaburagi', 'Kodagu', 'Kolar', 'Koppal', 'Mandya', 'Mysuru', 'Raichur', 'Ramanagara', 'Shivamogga', 'Tumakuru', 'Udupi', 'Uttara Kannada', 'Vijayapura', 'Yadgir']
-    },
-    'Kerala': {
-        'climate': 'Tropical humid',
-        'major_crops': ['rice', 'coconut', 'rubber', 'spices', 'cashew'],
-        'soil_types': ['laterite', 'alluvial', 'coastal'],
-        'rainfall': '2500-3500mm',
-        'districts': ['Alappuzha', 'Ernakulam', 'Idukki', 'Kannur', 'Kasaragod', 'Kollam', 'Kottayam', 'Kozhikode', 'Malappuram', 'Palakkad', 'Pathanamthitta', 'Thiruvananthapuram', 'Thrissur', 'Wayanad']
-    },
-    'Madhya Pradesh': {
-        'climate': 'Tropical to subtropical',
-        'major_crops': ['wheat', 'soybean', 'gram', 'rice', 'cotton'],
-        'soil_types': ['black', 'red', 'alluvial'],
-        'rainfall': '800-1600mm',
-        'districts': ['Agar Malwa', 'Alirajpur', 'Anuppur', 'Ashoknagar', 'Balaghat', 'Barwani', 'Betul', 'Bhind', 'Bhopal', 'Burhanpur', 'Chhatarpur', 'Chhindwara', 'Damoh', 'Datia', 'Dewas', 'Dhar', 'Dindori', 'Guna', 'Gwalior', 'Harda', 'Hoshangabad', 'Indore', 'Jabalpur', 'Jhabua', 'Katni', 'Khandwa', 'Khargone', 'Mandla', 'Mandsaur', 'Morena', 'Narsinghpur', 'Neemuch', 'Niwari', 'Panna', 'Raisen', 'Rajgarh', 'Ratlam', 'Rewa', 'Sagar', 'Satna', 'Sehore', 'Seoni', 'Shahdol', 'Shajapur', 'Sheopur', 'Shivpuri', 'Sidhi', 'Singrauli', 'Tikamgarh', 'Ujjain', 'Umaria', 'Vidisha']
-    },
-    'Maharashtra': {
-        'climate': 'Tropical to semi-arid',
-        'major_crops': ['cotton', 'sugarcane', 'rice', 'wheat', 'pulses'],
-        'soil_types': ['black', 'red', 'laterite'],
-        'rainfall': '400-3000mm',
-        'districts': ['Ahmednagar', 'Akola', 'Amravati', 'Aurangabad', 'Beed', 'Bhandara', 'Buldhana', 'Chandrapur', 'Dhule', 'Gadchiroli', 'Gondia', 'Hingoli', 'Jalgaon', 'Jalna', 'Kolhapur', 'Latur', 'Mumbai City', 'Mumbai Suburban', 'Nagpur', 'Nanded', 'Nandurbar', 'Nashik', 'Osmanabad', 'Palghar', 'Parbhani', 'Pune', 'Raigad', 'Ratnagiri', 'Sangli', 'Satara', 'Sindhudurg', 'Solapur', 'Thane', 'Wardha', 'Washim', 'Yavatmal']
-    },
-    'Manipur': {
-        'climate': 'Subtropical to temperate',
-        'major_crops': ['rice', 'maize', 'pulses', 'oilseeds', 'sugarcane'],
-        'soil_types': ['red', 'alluvial'],
-        'rainfall': '1500-2500mm',
-        'districts': ['Bishnupur', 'Chandel', 'Churachandpur', 'Imphal East', 'Imphal West', 'Jiribam', 'Kakching', 'Kamjong', 'Kangpokpi', 'Noney', 'Pherzawl', 'Senapati', 'Tamenglong', 'Tengnoupal', 'Thoubal', 'Ukhrul']
-    },
-    'Meghalaya': {
-        'climate': 'Subtropical with heavy rainfall',
-        'major_crops': ['rice', 'maize', 'potato', 'pulses', 'pineapple'],
-        'soil_types': ['red', 'laterite'],
-        'rainfall': '2000-12000mm',
-        'districts': ['East Garo Hills', 'East Jaintia Hills', 'East Khasi Hills', 'North Garo Hills', 'Ri Bhoi', 'South Garo Hills', 'South West Garo Hills', 'South West Khasi Hills', 'West Garo Hills', 'West Jaintia Hills', 'West Khasi Hills']
-    },
-    'Mizoram': {
-        'climate': 'Subtropical',
-        'major_crops': ['rice', 'maize', 'pulses', 'oilseeds', 'cotton'],
-        'soil_types': ['red', 'laterite'],
-        'rainfall': '2000-3000mm',
-        'districts': ['Aizawl', 'Champhai', 'Kolasib', 'Lawngtlai', 'Lunglei', 'Mamit', 'Saiha', 'Serchhip']
-    },
-    'Nagaland': {
-        'climate': 'Subtropical to temperate',
-        'major_crops': ['rice', 'maize', 'millet', 'pulses', 'oilseeds'],
-        'soil_types': ['red', 'laterite'],
-        'rainfall': '2000-2500mm',
-        'districts': ['Dimapur', 'Kiphire', 'Kohima', 'Longleng', 'Mokokchung', 'Mon', 'Peren', 'Phek', 'Tuensang', 'Wokha', 'Zunheboto']
-    },
-    'Odisha': {
-        'climate': 'Tropical',
-        'major_crops': ['rice', 'pulses', 'oilseeds', 'jute', 'sugarcane'],
-        'soil_types': ['red', 'laterite', 'alluvial'],
-        'rainfall': '1200-1600mm',
-        'districts': ['Angul', 'Balangir', 'Balasore', 'Bargarh', 'Bhadrak', 'Boudh', 'Cuttack', 'Deogarh', 'Dhenkanal', 'Gajapati', 'Ganjam', 'Jagatsinghpur', 'Jajpur', 'Jharsuguda', 'Kalahandi', 'Kandhamal', 'Kendrapara', 'Kendujhar', 'Khordha', 'Koraput', 'Malkangiri', 'Mayurbhanj', 'Nabarangpur', 'Nayagarh', 'Nuapada', 'Puri', 'Rayagada', 'Sambalpur', 'Subarnapur', 'Sundargarh']
-    },
-    'Punjab': {
-        'climate': 'Semi-arid to sub-humid',
-        'major_crops': ['wheat', 'rice', 'cotton', 'sugarcane', 'maize'],
-        'soil_types': ['alluvial'],
-        'rainfall': '400-600mm',
-        'districts': ['Amritsar', 'Barnala', 'Bathinda', 'Faridkot', 'Fatehgarh Sahib', 'Fazilka', 'Ferozepur', 'Gurdaspur', 'Hoshiarpur', 'Jalandhar', 'Kapurthala', 'Ludhiana', 'Mansa', 'Moga', 'Mohali', 'Muktsar', 'Pathankot', 'Patiala', 'Rupnagar', 'Sangrur', 'Shaheed Bhagat Singh Nagar', 'Tarn Taran']
-    },
-    'Rajasthan': {
-        'climate': 'Arid to semi-arid',
-        'major_crops': ['bajra', 'wheat', 'barley', 'pulses', 'mustard'],
-        'soil_types': ['sandy', 'alluvial'],
-        'rainfall': '100-600mm',
-        'districts': ['Ajmer', 'Alwar', 'Banswara', 'Baran', 'Barmer', 'Bharatpur', 'Bhilwara', 'Bikaner', 'Bundi', 'Chittorgarh', 'Churu', 'Dausa', 'Dholpur', 'Dungarpur', 'Hanumangarh', 'Jaipur', 'Jaisalmer', 'Jalore', 'Jhalawar', 'Jhunjhunu', 'Jodhpur', 'Karauli', 'Kota', 'Nagaur', 'Pali', 'Pratapgarh', 'Rajsamand', 'Sawai Madhopur', 'Sikar', 'Sirohi', 'Sri Ganganagar', 'Tonk', 'Udaipur']
-    },
-    'Sikkim': {
-        'climate': 'Temperate to alpine',
-        'major_crops': ['maize', 'rice', 'wheat', 'barley', 'cardamom'],
-        'soil_types': ['mountain', 'alluvial'],
-        'rainfall': '2000-3500mm',
-        'districts': ['East Sikkim', 'North Sikkim', 'South Sikkim', 'West Sikkim']
-    },
-    'Tamil Nadu': {
-        'climate': 'Tropical',
-        'major_crops': ['rice', 'sugarcane', 'cotton', 'groundnut', 'millets'],
-        'soil_types': ['red', 'black', 'alluvial'],
-        'rainfall': '900-1400mm',
-        'districts': ['Ariyalur', 'Chengalpattu', 'Chennai', 'Coimbatore', 'Cuddalore', 'Dharmapuri', 'Dindigul', 'Erode', 'Kallakurichi', 'Kanchipuram', 'Kanyakumari', 'Karur', 'Krishnagiri', 'Madurai', 'Mayiladuthurai', 'Nagapattinam', 'Namakkal', 'Nilgiris', 'Perambalur', 'Pudukkottai', 'Ramanathapuram', 'Ranipet', 'Salem', 'Sivaganga', 'Tenkasi', 'Thanjavur', 'Theni', 'Thoothukudi', 'Tiruchirappalli', 'Tirunelveli', 'Tirupathur', 'Tiruppur', 'Tiruvallur', 'Tiruvannamalai', 'Tiruvarur', 'Vellore', 'Viluppuram', 'Virudhunagar']
-    },
-    'Telangana': {
-        'climate': 'Tropical',
-        'major_crops': ['rice', 'cotton', 'maize', 'sugarcane', 'turmeric'],
-        'soil_types': ['red', 'black'],
-        'rainfall': '900-1200mm',
-        'districts': ['Adilabad', 'Bhadradri Kothagudem', 'Hyderabad', 'Jagtial', 'Jangaon', 'Jayashankar', 'Jogulamba', 'Kamareddy', 'Karimnagar', 'Khammam', 'Kumuram Bheem', 'Mahabubabad', 'Mahbubnagar', 'Mancherial', 'Medak', 'Medchal', 'Nagarkurnool', 'Nalgonda', 'Nirmal', 'Nizamabad', 'Peddapalli', 'Rajanna Sircilla', 'Rangareddy', 'Sangareddy', 'Siddipet', 'Suryapet', 'Vikarabad', 'Wanaparthy', 'Warangal Rural', 'Warangal Urban', 'Yadadri Bhuvanagiri']
-    },
-    'Tripura': {
-        'climate': 'Subtropical',
-        'major_crops': ['rice', 'jute', 'tea', 'rubber', 'pineapple'],
-        'soil_types': ['alluvial', 'laterite'],
-        'rainfall': '2000-2500mm',
-        'districts': ['Dhalai', 'Gomati', 'Khowai', 'North Tripura', 'Sepahijala', 'South Tripura', 'Unakoti', 'West Tripura']
-    },
-    'Uttar Pradesh': {
-        'climate': 'Subtropical',
-        'major_crops': ['wheat', 'rice', 'sugarcane', 'potato', 'pulses'],
-        'soil_types': ['alluvial'],
-        'rainfall': '600-1200mm',
-        'districts': ['Agra', 'Aligarh', 'Prayagraj', 'Ambedkar Nagar', 'Amethi', 'Amroha', 'Auraiya', 'Azamgarh', 'Baghpat', 'Bahraich', 'Ballia', 'Balrampur', 'Banda', 'Barabanki', 'Bareilly', 'Basti', 'Bijnor', 'Budaun', 'Bulandshahr', 'Chandauli', 'Chitrakoot', 'Deoria', 'Etah', 'Etawah', 'Ayodhya', 'Farrukhabad', 'Fatehpur', 'Firozabad', 'Gautam Buddha Nagar', 'Ghaziabad', 'Ghazipur', 'Gonda', 'Gorakhpur', 'Hamirpur', 'Hapur', 'Hardoi', 'Hathras', 'Jalaun', 'Jaunpur', 'Jhansi', 'Kannauj', 'Kanpur Dehat', 'Kanpur Nagar', 'Kasganj', 'Kaushambi', 'Kheri', 'Kushinagar', 'Lalitpur', 'Lucknow', 'Maharajganj', 'Mahoba', 'Mainpuri', 'Mathura', 'Mau', 'Meerut', 'Mirzapur', 'Moradabad', 'Muzaffarnagar', 'Pilibhit', 'Pratapgarh', 'Raebareli', 'Rampur', 'Saharanpur', 'Sambhal', 'Sant Kabir Nagar', 'Shahjahanpur', 'Shamli', 'Shravasti', 'Siddharthnagar', 'Sitapur', 'Sonbhadra', 'Sultanpur', 'Unnao', 'Varanasi']
-    },
-    'Uttarakhand': {
-        'climate': 'Temperate to alpine',
-        'major_crops': ['rice', 'wheat', 'sugarcane', 'potato', 'pulses'],
-        'soil_types': ['alluvial', 'mountain'],
-        'rainfall': '1000-2000mm',
-        'districts': ['Almora', 'Bageshwar', 'Chamoli', 'Champawat', 'Dehradun', 'Haridwar', 'Nainital', 'Pauri Garhwal', 'Pithoragarh', 'Rudraprayag', 'Tehri Garhwal', 'Udham Singh Nagar', 'Uttarkashi']
-    },
-    'West Bengal': {
-        'climate': 'Tropical to subtropical',
-        'major_crops': ['rice', 'jute', 'tea', 'potato', 'wheat'],
-        'soil_types': ['alluvial', 'red', 'laterite'],
-        'rainfall': '1500-2500mm',
-        'districts': ['Alipurduar', 'Bankura', 'Birbhum', 'Cooch Behar', 'Dakshin Dinajpur', 'Darjeeling', 'Hooghly', 'Howrah', 'Jalpaiguri', 'Jhargram', 'Kalimpong', 'Kolkata', 'Malda', 'Murshidabad', 'Nadia', 'North 24 Parganas', 'Paschim Bardhaman', 'Paschim Medinipur', 'Purba Bardhaman', 'Purba Medinipur', 'Purulia', 'South 24 Parganas', 'Uttar Dinajpur']
-    },
-    'Delhi': {
-        'climate': 'Semi-arid',
-        'major_crops': ['wheat', 'vegetables', 'fruits', 'flowers'],
-        'soil_types': ['alluvial'],
-        'rainfall': '600-700mm',
-        'districts': ['Central Delhi', 'East Delhi', 'New Delhi', 'North Delhi', 'North East Delhi', 'North West Delhi', 'Shahdara', 'South Delhi', 'South East Delhi', 'South West Delhi', 'West Delhi']
-    },
-    'Jammu and Kashmir': {
-        'climate': 'Temperate to alpine',
-        'major_crops': ['rice', 'wheat', 'maize', 'barley', 'apples'],
-        'soil_types': ['alluvial', 'mountain'],
-        'rainfall': '400-1500mm',
-        'districts': ['Anantnag', 'Bandipora', 'Baramulla', 'Budgam', 'Doda', 'Ganderbal', 'Jammu', 'Kathua', 'Kishtwar', 'Kulgam', 'Kupwara', 'Poonch', 'Pulwama', 'Rajouri', 'Ramban', 'Reasi', 'Samba', 'Shopian', 'Srinagar', 'Udhampur']
-    },
-    'Ladakh': {
-        'climate': 'Cold desert',
-        'major_crops': ['barley', 'wheat', 'peas', 'apricot', 'apple'],
-        'soil_types': ['mountain', 'desert'],
-        'rainfall': '100-200mm',
-        'districts': ['Kargil', 'Leh']
-    }
+# Recommendation cache settings
+CACHE_TTL_SECONDS = int(os.getenv('RECOMMENDATION_CACHE_TTL', 6 * 60 * 60))
+CACHE_MAX_ENTRIES = int(os.getenv('RECOMMENDATION_CACHE_MAX_ENTRIES', 2048))
+CACHE_MAX_BYTES = int(os.getenv('RECOMMENDATION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+CACHE_DB_PATH = os.getenv('RECOMMENDATION_CACHE_DB')
+
+# Translation pipeline: generate in English once, then localize value strings
+TRANSLATION_PIPELINE = os.getenv('TRANSLATION_PIPELINE', '').lower() in ('1', 'true', 'yes')
+TRANSLATION_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', 60))
+PHRASE_MEMO_TTL = int(os.getenv('PHRASE_MEMO_TTL', 30 * 24 * 60 * 60))
+PHRASE_MEMO_MAX_ENTRIES = int(os.getenv('PHRASE_MEMO_MAX_ENTRIES', 50000))
+PHRASE_MEMO_MAX_BYTES = int(os.getenv('PHRASE_MEMO_MAX_BYTES', 16 * 1024 * 1024))
+
+# Static payload caching
+STATES_MAX_AGE = int(os.getenv('STATES_CACHE_MAX_AGE', 60 * 60))
+
+# Frontend: src/index.html plus the files in src/assets, minified and
+# precompressed at startup. Assets are served under content-hashed names.
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+ASSET_MIMETYPES = {'.css': 'text/css', '.js': 'text/javascript', '.html': 'text/html'}
+
+# Per-process limit on concurrent Gemini calls; once UPSTREAM_MAX_WAITING
+# requests are queued for a slot, new ones are shed to rule-based results
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv('UPSTREAM_MAX_CONCURRENCY', 32))
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv('UPSTREAM_QUEUE_TIMEOUT', 10))
+UPSTREAM_MAX_WAITING = int(os.getenv('UPSTREAM_MAX_WAITING', UPSTREAM_MAX_CONCURRENCY))
+
+# Per-client token buckets for the recommendation endpoints, in requests per
+# minute (0 disables). Requests carrying a key from API_KEYS in X-API-Key get
+# their own bucket; everyone else is limited by IP.
+RATE_LIMIT_PER_MINUTE = float(os.getenv('RATE_LIMIT_PER_MINUTE', 60))
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 20))
+API_KEY_RATE_LIMIT_PER_MINUTE = float(os.getenv('API_KEY_RATE_LIMIT_PER_MINUTE', 600))
+API_KEY_RATE_LIMIT_BURST = int(os.getenv('API_KEY_RATE_LIMIT_BURST', 100))
+API_KEYS = {key.strip() for key in os.getenv('API_KEYS', '').split(',') if key.strip()}
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB')
+
+def parse_proxy_count(value: str) -> int:
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return 0
+    if value in ('true', 'yes', 'on'):
+        return 1
+    if value.isdigit():
+        return int(value)
+    raise ValueError(f'RATE_LIMIT_TRUST_PROXY must be a number of proxies or true/false, not {value!r}')
+
+# Number of reverse proxies in front of the app that append to X-Forwarded-For
+# ("true" means one); 0 keys clients by the socket address.
+RATE_LIMIT_TRUST_PROXY = parse_proxy_count(os.getenv('RATE_LIMIT_TRUST_PROXY', '0'))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', 100000))
+RATE_LIMITED_ENDPOINTS = {'recommend', 'recommend_stream', 'recommend_batch', 'create_recommendation_job'}
+
+# Batch recommendation settings
+BATCH_MAX_ROWS = int(os.getenv('BATCH_MAX_ROWS', 10000))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 8))
+BATCH_RATE_LIMIT = float(os.getenv('BATCH_RATE_LIMIT', 5))
+BATCH_CHECKPOINT_EVERY = int(os.getenv('BATCH_CHECKPOINT_EVERY', 25))
+BATCH_CSV_FIELDS = ['row', 'state', 'district', 'soil_type', 'season', 'language', 'primary_crops', 'secondary_crops', 'state_specific_crops', 'recommended_crops', 'error']
+
+# Precomputed recommendation store filled by `python main.py warm`
+PRECOMPUTED_DB_PATH = os.getenv('PRECOMPUTED_DB')
+PRECOMPUTED_MAX_AGE_DAYS = float(os.getenv('PRECOMPUTED_MAX_AGE_DAYS', 30))
+WARM_RATE_LIMIT = float(os.getenv('WARM_RATE_LIMIT', 2))
+# Choices of the frontend's irrigation select; every form post sends one
+IRRIGATION_OPTIONS = ['yes', 'no', 'partial']
+
+# Metrics and per-request stage profiling
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+
+# Upper bound on memoized rule engine matches
+RULE_MATCH_MEMO_SIZE = int(os.getenv('RULE_MATCH_MEMO_SIZE', 50000))
+
+# Gemini retry, deadline and circuit breaker settings
+GEMINI_ATTEMPT_TIMEOUT = float(os.getenv('GEMINI_ATTEMPT_TIMEOUT', 20))
+GEMINI_REQUEST_DEADLINE = float(os.getenv('GEMINI_REQUEST_DEADLINE', 45))
+RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 0.5))
+RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', 8))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+
+# Request coalescing; the cross-worker lease lives in the shared cache database
+SINGLE_FLIGHT_LEASE_SECONDS = float(os.getenv('SINGLE_FLIGHT_LEASE_SECONDS', GEMINI_REQUEST_DEADLINE + 5))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL', 0.2))
+
+# Asynchronous recommendation jobs, queued in a local SQLite file and run by
+# background threads in every worker process
+JOBS_DB = os.getenv('JOBS_DB', 'jobs.db')
+JOBS_WORKERS = int(os.getenv('JOBS_WORKERS', 4))
+JOBS_MAX_QUEUED = int(os.getenv('JOBS_MAX_QUEUED', 10000))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+JOBS_LEASE_SECONDS = float(os.getenv('JOBS_LEASE_SECONDS', GEMINI_REQUEST_DEADLINE * 2))
+JOBS_RESULT_TTL = float(os.getenv('JOBS_RESULT_TTL', 24 * 60 * 60))
+JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', 1))
+JOBS_MAX_WAIT = float(os.getenv('JOBS_MAX_WAIT', 30))
+JOBS_MAX_PRIORITY = 9
+JOBS_DEFAULT_PRIORITY = 5
+
+# Agronomy tables live in a versioned JSON file compiled to a read-only SQLite
+# file next to it; workers memory-map the compiled file and poll both for changes
+AGRONOMY_DATA_PATH = os.getenv('AGRONOMY_DATA_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'agronomy.json'))
+AGRONOMY_DB_PATH = os.getenv('AGRONOMY_DB_PATH', os.path.splitext(AGRONOMY_DATA_PATH)[0] + '.db')
+AGRONOMY_RELOAD_INTERVAL = float(os.getenv('AGRONOMY_RELOAD_INTERVAL', 5))
+AGRONOMY_MMAP_SIZE = int(os.getenv('AGRONOMY_MMAP_SIZE', 64 * 1024 * 1024))
+AGRONOMY_SCHEMA_VERSION = 1
+AGRONOMY_TABLES = ('state_language_map', 'languages', 'states', 'soils', 'seasons', 'state_aliases', 'district_aliases')
+AGRONOMY_ENTRY_FIELDS = {
+    'states': {'districts': list, 'major_crops': list, 'soil_types': list, 'climate': str, 'rainfall': str},
+    'soils': {'primary': list, 'secondary': list},
+    'languages': {'name': str}
 }
 
-# Soil database
-SOIL_CROP_DB = {
-    'sandy': {
-        'primary': ['groundnut', 'millet', 'watermelon', 'pulses'],
-        'secondary': ['maize', 'sunflower', 'cashew'],
-        'characteristics': 'Well-drained, low water retention, low nutrients',
-        'improvement': 'Add organic matter, mulching, frequent irrigation'
-    },
-    'clay': {
-        'primary': ['rice', 'wheat', 'sugarcane', 'cotton'],
-        'secondary': ['jute', 'soybean', 'lentil'],
-        'characteristics': 'High water retention, nutrient-rich, poor drainage',
-        'improvement': 'Add gypsum, organic matter, improve drainage'
-    },
-    'loam': {
-        'primary': ['wheat', 'potato', 'vegetables', 'maize'],
-        'secondary': ['pulses', 'oilseeds', 'sugarcane'],
-        'characteristics': 'Balanced drainage and nutrients, ideal for most crops',
-        'improvement': 'Maintain organic matter, crop rotation'
-    },
-    'red': {
-        'primary': ['groundnut', 'cotton', 'pulses', 'millets'],
-        'secondary': ['maize', 'oilseeds', 'tobacco'],
-        'characteristics': 'Iron-rich, porous, low fertility',
-        'improvement': 'Add lime, fertilizers, green manuring'
-    },
-    'black': {
-        'primary': ['cotton', 'soybean', 'sorghum', 'wheat'],
-        'secondary': ['sunflower', 'pulses', 'safflower'],
-        'characteristics': 'Moisture retentive, rich in calcium and magnesium',
-        'improvement': 'Proper drainage, avoid over-watering'
-    },
-    'alluvial': {
-        'primary': ['rice', 'wheat', 'sugarcane', 'jute'],
-        'secondary': ['maize', 'pulses', 'vegetables'],
-        'characteristics': 'Fertile, well-drained, rich in potash',
-        'improvement': 'Regular fertilization, crop rotation'
-    },
-    'laterite': {
-        'primary': ['cashew', 'coconut', 'rubber', 'areca nut'],
-        'secondary': ['tapioca', 'pulses', 'groundnut'],
-        'characteristics': 'Acidic, poor in nutrients, good drainage',
-        'improvement': 'Add lime, organic manure, mulching'
-    },
-    'mountain': {
-        'primary': ['wheat', 'barley', 'potato', 'maize'],
-        'secondary': ['pulses', 'oilseeds', 'vegetables'],
-        'characteristics': 'Variable, often rocky, moderate fertility',
-        'improvement': 'Terracing, erosion control, organic matter'
+# Minimum trigram similarity to accept a misspelled state or district, and to
+# offer it as a suggestion
+PLACE_MATCH_THRESHOLD = float(os.getenv('PLACE_MATCH_THRESHOLD', 0.75))
+PLACE_SUGGEST_THRESHOLD = float(os.getenv('PLACE_SUGGEST_THRESHOLD', 0.4))
+AUTOCOMPLETE_MAX_RESULTS = int(os.getenv('AUTOCOMPLETE_MAX_RESULTS', 20))
+
+def parse_agronomy_source(raw: bytes) -> Dict:
+    source = app.json.loads(raw)
+    if source.get('version') != AGRONOMY_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported agronomy data version: {source.get('version')}")
+    missing = [table for table in AGRONOMY_TABLES if not isinstance(source.get(table), dict)]
+    if missing:
+        raise ValueError(f"Agronomy data is missing tables: {', '.join(missing)}")
+    # Entries are checked for the keys the service reads, so a bad edit is
+    # rejected at load instead of failing requests later
+    for table, fields in AGRONOMY_ENTRY_FIELDS.items():
+        for key, entry in source[table].items():
+            invalid = [field for field, kind in fields.items() if not isinstance(entry, dict) or not isinstance(entry.get(field), kind)]
+            if invalid:
+                raise ValueError(f"Agronomy {table} entry {key!r} has missing or invalid fields: {', '.join(invalid)}")
+    invalid = [season for season, crops in source['seasons'].items() if not isinstance(crops, list)]
+    if invalid:
+        raise ValueError(f"Agronomy seasons must be crop lists: {', '.join(invalid)}")
+    return {table: source[table] for table in AGRONOMY_TABLES}
+
+def compile_agronomy_data(source_path: str, db_path: str) -> str:
+    # Writes to a temporary file and renames it, so readers in other workers
+    # only ever see a complete database.
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    tables = parse_agronomy_source(raw)
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    tmp_path = f'{db_path}.{os.getpid()}.tmp'
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            conn.execute(
+                'CREATE TABLE entries (tbl TEXT NOT NULL, key TEXT NOT NULL, position INTEGER NOT NULL, '
+                'value TEXT NOT NULL, PRIMARY KEY (tbl, key)) WITHOUT ROWID'
+            )
+            conn.executemany('INSERT INTO meta VALUES (?, ?)', [('schema_version', str(AGRONOMY_SCHEMA_VERSION)), ('digest', digest)])
+            conn.executemany(
+                'INSERT INTO entries VALUES (?, ?, ?, ?)',
+                ((table, key, position, app.json.dumps(value)) for table in AGRONOMY_TABLES for position, (key, value) in enumerate(tables[table].items()))
+            )
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return digest
+
+class AgronomyStore:
+    def __init__(self, source_path: str, db_path: str, reload_interval: float, mmap_size: int):
+        self.source_path = source_path
+        self.db_path = db_path
+        self.reload_interval = reload_interval
+        self.mmap_size = mmap_size
+        self.version = None
+        self.compiled = False
+        self.reloads = 0
+        self.errors = 0
+        self._mtimes = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f'file:{quote(os.path.abspath(self.db_path))}?mode=ro', uri=True)
+        conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+        return conn
+
+    def _file_mtimes(self) -> tuple:
+        return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in (self.source_path, self.db_path))
+
+    def _compiled_digest(self) -> Optional[str]:
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'digest'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def load(self) -> Dict:
+        # The compiled file is rebuilt whenever it does not match the source.
+        # If it cannot be written (read-only deploy), the source is used as is.
+        mtimes = self._file_mtimes()
+        if mtimes[0] is not None:
+            with open(self.source_path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()[:16]
+            if self._compiled_digest() != digest:
+                try:
+                    compile_agronomy_data(self.source_path, self.db_path)
+                    logger.info(f"Compiled agronomy data {digest} to {self.db_path}")
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Could not compile agronomy data, reading {self.source_path} directly: {str(e)}")
+                    snapshot = AgronomySnapshot(digest, parse_agronomy_source(raw))
+                    self._mtimes = mtimes
+                    self.compiled = False
+                    self.version = digest
+                    return snapshot
+        
+        conn = self._connect()
+        try:
+            digest = conn.execute("SELECT value FROM meta WHERE key = 'digest'").fetchone()[0]
+            tables = {table: {} for table in AGRONOMY_TABLES}
+            for table, key, value in conn.execute('SELECT tbl, key, value FROM entries ORDER BY tbl, position'):
+                tables[table][key] = app.json.loads(value)
+        finally:
+            conn.close()
+        snapshot = AgronomySnapshot(digest, tables)
+        self._mtimes = self._file_mtimes()
+        self.compiled = True
+        self.version = digest
+        return snapshot
+
+    def maybe_reload(self) -> Optional['AgronomySnapshot']:
+        # Called on every request; stats the files at most once per interval
+        # and returns a new snapshot only when the content changed. The
+        # version is recorded only once the snapshot and its indexes are built.
+        if self.reload_interval <= 0 or time.monotonic() < self._next_check:
+            return None
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            mtimes = self._file_mtimes()
+            if mtimes == self._mtimes:
+                return None
+            previous = self.version
+            try:
+                snapshot = self.load()
+                snapshot.location_index
+            except (OSError, ValueError, KeyError, TypeError, AttributeError, sqlite3.Error) as e:
+                self.version = previous
+                self._mtimes = self._file_mtimes()
+                self.errors += 1
+                logger.error(f"Agronomy data reload failed, keeping version {previous}: {str(e)}")
+                return None
+            if snapshot.version == previous:
+                return None
+            self.reloads += 1
+            return snapshot
+        finally:
+            self._lock.release()
+
+    def stats(self) -> Dict:
+        return {
+            'version': self.version,
+            'compiled': self.compiled,
+            'reloads': self.reloads,
+            'errors': self.errors
+        }
+
+agronomy_store = AgronomyStore(AGRONOMY_DATA_PATH, AGRONOMY_DB_PATH, AGRONOMY_RELOAD_INTERVAL, AGRONOMY_MMAP_SIZE)
+
+# Inputs that shape the AI prompt, used to build the cache key
+CACHE_KEY_FIELDS = ['state', 'district', 'soil_type', 'season', 'farm_size', 'irrigation', 'budget', 'previous_crop', 'crop_count']
+
+class RecommendationCache:
+    def __init__(self, ttl: int, max_entries: int, max_bytes: int, db_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._writes = itertools.count()
+        self._lock = threading.Lock()
+        if db_path:
+            with self._connect() as conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS recommendations (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+                conn.execute('CREATE INDEX IF NOT EXISTS recommendations_expires_at ON recommendations (expires_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.peek(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def peek(self, key: str) -> Optional[str]:
+        # Same lookup as get() without counting a hit or miss, for callers that
+        # poll (e.g. waiting on another worker's single-flight lease)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                return entry[0]
+            if entry:
+                self._evict(key)
+
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute('SELECT value, expires_at FROM recommendations WHERE key = ?', (key,)).fetchone()
+                if row and row[1] > now:
+                    self._store(key, row[0], row[1])
+                    return row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Cache read failed: {str(e)}")
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl
+        self._store(key, value, expires_at)
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute('INSERT OR REPLACE INTO recommendations (key, value, expires_at) VALUES (?, ?, ?)', (key, value, expires_at))
+                    # Expired rows are never served, so purging them can wait;
+                    # the phrase memo shares this table and writes per phrase
+                    if next(self._writes) % 1000 == 0:
+                        conn.execute('DELETE FROM recommendations WHERE expires_at <= ?', (time.time(),))
+            except sqlite3.Error as e:
+                logger.warning(f"Cache write failed: {str(e)}")
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (value, expires_at, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'persistent': bool(self.db_path)
+            }
+
+recommendation_cache = RecommendationCache(CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_DB_PATH)
+phrase_memo = RecommendationCache(PHRASE_MEMO_TTL, PHRASE_MEMO_MAX_ENTRIES, PHRASE_MEMO_MAX_BYTES, CACHE_DB_PATH)
+
+class Metrics:
+    # Minimal in-process registry rendered in the Prometheus text format.
+    # Each gunicorn worker keeps its own values.
+    def __init__(self):
+        self._meta = {}
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, metric_type: str, help_text: str, buckets: tuple = LATENCY_BUCKETS) -> None:
+        self._meta[name] = (metric_type, help_text, buckets)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        buckets = self._meta[name][2]
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def render(self, extra_gauges: Dict) -> str:
+        lines = []
+        with self._lock:
+            series = {}
+            for (name, labels), value in list(self._counters.items()) + list(self._gauges.items()):
+                series.setdefault(name, []).append(f'{name}{format_labels(labels)} {value}')
+            for (name, labels), histogram in self._histograms.items():
+                buckets = self._meta[name][2]
+                for bound, count in zip(buckets, histogram['buckets']):
+                    series.setdefault(name, []).append(f'{name}_bucket{format_labels(labels + (("le", bound),))} {count}')
+                series[name].append(f'{name}_bucket{format_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+                series[name].append(f'{name}_sum{format_labels(labels)} {histogram["sum"]}')
+                series[name].append(f'{name}_count{format_labels(labels)} {histogram["count"]}')
+        
+        for name, (metric_type, help_text, _) in self._meta.items():
+            if name in series:
+                lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}'] + series[name])
+        for name, value in extra_gauges.items():
+            lines.extend([f'# TYPE {name} gauge', f'{name} {value}'])
+        return '\n'.join(lines) + '\n'
+
+def format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+metrics = Metrics()
+metrics.describe('crop_http_requests_total', 'counter', 'HTTP requests by endpoint and status')
+metrics.describe('crop_http_request_seconds', 'histogram', 'HTTP request latency by endpoint')
+metrics.describe('crop_http_requests_in_flight', 'gauge', 'HTTP requests currently being served')
+metrics.describe('crop_response_bytes', 'histogram', 'Response body size by endpoint, state and language', SIZE_BUCKETS)
+metrics.describe('crop_stage_seconds', 'histogram', 'Time spent in each /recommend stage by state and language')
+metrics.describe('crop_gemini_attempt_seconds', 'histogram', 'Gemini call latency per attempt by outcome')
+metrics.describe('crop_gemini_retries_total', 'counter', 'Gemini attempts retried after a failure')
+metrics.describe('crop_fallbacks_total', 'counter', 'Requests answered with rule-based suggestions only')
+metrics.describe('crop_gemini_tokens_total', 'counter', 'Gemini tokens by kind (prompt or output)')
+metrics.describe('crop_rate_limited_total', 'counter', 'Requests rejected by the per-client rate limiter')
+metrics.describe('crop_parse_results_total', 'counter', 'AI response parses by outcome (clean, repaired, failed)')
+
+def get_metric_labels() -> Dict:
+    # Only known states and languages become label values, which keeps the
+    # number of series bounded.
+    data = getattr(g, 'metric_data', None) or {}
+    state = data.get('state', '')
+    language = data.get('language', 'english')
+    snapshot = get_agronomy()
+    return {
+        'state': state if state in snapshot.states else 'other',
+        'language': language if language in snapshot.languages else 'other'
     }
-}
 
-# Seasonal crops
-SEASONAL_CROPS = {
-    'kharif': ['rice', 'maize', 'cotton', 'soybean', 'groundnut', 'bajra', 'jowar', 'tur', 'moong', 'urad'],
-    'rabi': ['wheat', 'mustard', 'potato', 'chickpea', 'lentil', 'barley', 'peas', 'gram', 'onion'],
-    'zaid': ['watermelon', 'cucumber', 'muskmelon', 'vegetables', 'fodder', 'bitter gourd', 'pumpkin'],
-    'perennial': ['sugarcane', 'banana', 'coconut', 'areca nut', 'cashew', 'rubber', 'tea', 'coffee']
-}
+@contextmanager
+def stage(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe('crop_stage_seconds', elapsed, stage=name, **get_metric_labels())
+        g.setdefault('stage_timings', []).append((name, elapsed))
+
+class UpstreamLimiter:
+    # Admission control for Gemini calls. A request that finds every slot busy
+    # waits up to `timeout` for one, unless `max_waiting` requests are already
+    # queued; then it is shed at once and the caller serves rule-based results.
+    def __init__(self, limit: int, timeout: float, max_waiting: int):
+        self.limit = limit
+        self.timeout = timeout
+        self.max_waiting = max_waiting
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.shed = 0
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self.waiting >= self.max_waiting:
+                    self.shed += 1
+                    logger.warning("Upstream queue full, shedding AI call")
+                    return False
+                self.waiting += 1
+            try:
+                acquired = self._semaphore.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Upstream concurrency limit reached, skipping AI call")
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'rejected': self.rejected,
+                'shed': self.shed
+            }
+
+upstream_limiter = UpstreamLimiter(UPSTREAM_MAX_CONCURRENCY, UPSTREAM_QUEUE_TIMEOUT, UPSTREAM_MAX_WAITING)
+
+class ClientRateLimiter:
+    # Token buckets keyed by client. Buckets live in an in-process LRU, or in
+    # a SQLite table shared by all workers when db_path is set (falling back
+    # to the in-process buckets if the database is unavailable).
+    def __init__(self, max_clients: int, db_path: Optional[str] = None):
+        self.max_clients = max_clients
+        self.db_path = db_path
+        self.allowed = 0
+        self.limited = 0
+        self._buckets = OrderedDict()
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+        if db_path:
+            with self._connect() as conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    @staticmethod
+    def _refill(bucket: Optional[tuple], rate: float, burst: int, now: float, cost: int = 1) -> tuple:
+        # Returns (tokens left, seconds until enough tokens or 0 if allowed)
+        tokens = burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+        if tokens >= cost:
+            return tokens - cost, 0.0
+        return tokens, (cost - tokens) / rate
+
+    def consume(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        now = time.time()
+        retry_after = None
+        if self.db_path:
+            try:
+                retry_after = self._consume_shared(key, rate, burst, now, cost)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared rate limit store failed: {str(e)}")
+        with self._lock:
+            if retry_after is None:
+                tokens, retry_after = self._refill(self._buckets.pop(key, None), rate, burst, now, cost)
+                self._buckets[key] = (tokens, now)
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            if retry_after:
+                self.limited += 1
+            else:
+                self.allowed += 1
+        return retry_after
+
+    def _consume_shared(self, key: str, rate: float, burst: int, now: float, cost: int) -> float:
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            bucket = conn.execute('SELECT tokens, updated FROM rate_limits WHERE key = ?', (key,)).fetchone()
+            tokens, retry_after = self._refill(bucket, rate, burst, now, cost)
+            conn.execute('INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?)', (key, tokens, now))
+            if next(self._calls) % 1000 == 0:
+                conn.execute('DELETE FROM rate_limits WHERE updated < ?', (now - 3600,))
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return retry_after
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'allowed': self.allowed,
+                'limited': self.limited,
+                'clients': len(self._buckets),
+                'shared': bool(self.db_path)
+            }
+
+client_rate_limiter = ClientRateLimiter(RATE_LIMIT_MAX_CLIENTS, RATE_LIMIT_DB)
+
+def get_client_identity() -> tuple:
+    # Returns (bucket key, tokens per second, burst) for the current request
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in API_KEYS:
+        return f"key:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]}", API_KEY_RATE_LIMIT_PER_MINUTE / 60, API_KEY_RATE_LIMIT_BURST
+    # Leftmost X-Forwarded-For entries are client-supplied; only the hop added
+    # by the outermost trusted proxy identifies the client.
+    route = request.access_route
+    address = route[-RATE_LIMIT_TRUST_PROXY] if RATE_LIMIT_TRUST_PROXY and len(route) >= RATE_LIMIT_TRUST_PROXY else request.remote_addr
+    return f'ip:{address}', RATE_LIMIT_PER_MINUTE / 60, RATE_LIMIT_BURST
+
+class GeminiClientPool:
+    # Long-lived models, each bound to its own keep-alive client/channel, so
+    # requests stop paying construction and TLS handshakes on the hot path.
+    def __init__(self, model_name: str, size: int, transport: str):
+        self.model_name = model_name
+        self.size = max(1, size)
+        self.transport = transport
+        self._models = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _create_models(self) -> List:
+        genai, glm = load_gemini_sdk()
+        models = []
+        for _ in range(self.size):
+            model = genai.GenerativeModel(self.model_name)
+            client = glm.GenerativeServiceClient(
+                client_options={'api_key': GEMINI_KEY},
+                transport=self.transport
+            )
+            for name in ('generate_content', 'stream_generate_content'):
+                setattr(client, name, self._with_timeout(getattr(client, name)))
+            model._client = client
+            models.append(model)
+        return models
+
+    def _with_timeout(self, method):
+        # GenerativeModel.generate_content does not forward a timeout, so the
+        # caller's per-attempt timeout is applied at the client call instead.
+        # The client's default Retry (60s, retries 503s) is disabled so our own
+        # retry loop and request deadline are the only ones in effect.
+        def call(request, **kwargs):
+            kwargs.setdefault('timeout', getattr(self._local, 'timeout', None))
+            kwargs.setdefault('retry', None)
+            return method(request, **kwargs)
+        return call
+
+    @contextmanager
+    def timeout(self, seconds: float):
+        self._local.timeout = seconds
+        try:
+            yield
+        finally:
+            self._local.timeout = None
+
+    def get_model(self):
+        if not self._models:
+            with self._lock:
+                if not self._models:
+                    self._models = self._create_models()
+        return self._models[next(self._counter) % self.size]
+
+    def warm_up(self, timeout: float) -> None:
+        import grpc
+        for _ in range(self.size):
+            model = self.get_model()
+            if self.transport != 'grpc':
+                continue
+            try:
+                grpc.channel_ready_future(model._client.transport.grpc_channel).result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Gemini channel warm-up failed: {e!r}")
+        logger.info(f"Warmed up {self.size} Gemini client(s) over {self.transport}")
+
+    def warm_up_in_background(self, timeout: float) -> threading.Thread:
+        # Lets a worker serve requests while the SDK loads and channels connect;
+        # an AI call arriving first simply waits on the pool lock.
+        thread = threading.Thread(target=self.warm_up, args=(timeout,), name='gemini-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+gemini_pool = GeminiClientPool(GEMINI_MODEL_NAME, GEMINI_POOL_SIZE, GEMINI_TRANSPORT)
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> tuple:
+        # Returns (allowed, is_probe). Only the caller that got the half-open
+        # probe may release it, so calls admitted while closed cannot let a
+        # second probe through.
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'closed':
+                return True, False
+            if self.state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True, True
+            self.short_circuited += 1
+            return False, False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != 'closed':
+                logger.info("Gemini circuit breaker closed")
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    logger.warning(f"Gemini circuit breaker opened after {self.failures} failure(s)")
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'short_circuited': self.short_circuited
+            }
+
+circuit_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+
+class SingleFlight:
+    # Concurrent callers with the same key share one upstream call. With a
+    # database path, a lease row extends this across gunicorn workers.
+    def __init__(self, lease_seconds: float, poll_interval: float, db_path: Optional[str] = None):
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.db_path = db_path
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._owner = f'{os.getpid()}-{id(self)}'
+        if db_path:
+            with self._connect() as conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def do(self, key: str, fn, lookup):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None}
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call['event'].wait()
+            return call['result']
+        
+        try:
+            call['result'] = self._run(key, fn, lookup) if self.db_path else fn()
+            return call['result']
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['event'].set()
+
+    def _run(self, key: str, fn, lookup):
+        deadline = time.monotonic() + self.lease_seconds
+        while not self._acquire_lease(key):
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+            result = lookup()
+            if result is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return result
+        
+        try:
+            return fn()
+        finally:
+            self._release_lease(key)
+
+    def _acquire_lease(self, key: str) -> bool:
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                    'WHERE leases.expires_at <= ?',
+                    (key, self._owner, now + self.lease_seconds, now)
+                )
+                return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            logger.warning(f"Lease acquisition failed: {str(e)}")
+            return True
+
+    def _release_lease(self, key: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, self._owner))
+        except sqlite3.Error as e:
+            logger.warning(f"Lease release failed: {str(e)}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'upstream_calls': self.leaders,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+                'cross_worker': bool(self.db_path)
+            }
+
+single_flight = SingleFlight(SINGLE_FLIGHT_LEASE_SECONDS, SINGLE_FLIGHT_POLL_INTERVAL, CACHE_DB_PATH)
+
+class PrecomputedStore:
+    # Recommendations generated ahead of time, keyed like the cache. Entries
+    # older than max_age are ignored by requests and refreshed by the warm job.
+    def __init__(self, db_path: Optional[str], max_age: float):
+        self.db_path = db_path
+        self.max_age = max_age
+        self.hits = 0
+        if db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS precomputed (key TEXT PRIMARY KEY, state TEXT, district TEXT, '
+                    'soil_type TEXT, season TEXT, language TEXT, response TEXT NOT NULL, created_at REAL NOT NULL)'
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT response FROM precomputed WHERE key = ? AND created_at > ?',
+                    (key, time.time() - self.max_age)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Precomputed store read failed: {str(e)}")
+            return None
+        if row:
+            self.hits += 1
+            return row[0]
+        return None
+
+    def put(self, key: str, data: Dict, language: str, response: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO precomputed VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, data.get('state'), data.get('district'), data.get('soil_type'), data.get('season'), language, response, time.time())
+            )
+
+    def created_at(self) -> Dict:
+        with self._connect() as conn:
+            return dict(conn.execute('SELECT key, created_at FROM precomputed').fetchall())
+
+    def stats(self) -> Dict:
+        return {'enabled': bool(self.db_path), 'hits': self.hits}
+
+precomputed_store = PrecomputedStore(PRECOMPUTED_DB_PATH, PRECOMPUTED_MAX_AGE_DAYS * 24 * 60 * 60)
+
+def is_retryable_error(error: Exception) -> bool:
+    from google.api_core import exceptions as google_exceptions
+    if isinstance(error, (google_exceptions.TooManyRequests, google_exceptions.ServerError)):
+        return True
+    # Other 4xx responses (bad request, auth, blocked content) will not succeed on retry
+    return not isinstance(error, google_exceptions.GoogleAPICallError)
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            return None
+    for detail in getattr(error, 'details', None) or []:
+        retry_delay = getattr(detail, 'retry_delay', None)
+        if retry_delay is not None:
+            return retry_delay.seconds + retry_delay.nanos / 1e9
+    return None
+
+def get_backoff_delay(error: Exception, attempt: int) -> float:
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        return retry_after
+    # Full jitter keeps workers from retrying in lockstep during a brownout
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+# Precompressed static payloads
+STATES_FIELDS = ['states', 'districts', 'state_data', 'languages', 'state_language_map']
+
+def build_precompressed(body: bytes, mimetype: str = 'application/json') -> Dict:
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    encodings = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=11)
+    return {'etag': etag, 'mimetype': mimetype, 'encodings': encodings}
+
+def send_precompressed(payload: Dict, max_age: int):
+    # Each encoding is its own representation with its own ETag; the encoding
+    # is negotiated first so a 304 names the representation the client would get.
+    headers = {
+        'Cache-Control': f'public, max-age={max_age}',
+        'Vary': 'Accept-Encoding'
+    }
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in payload['encodings'] and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    etag = payload['etag'] if encoding == 'identity' else f"{payload['etag']}-{encoding}"
+    
+    if etag in request.if_none_match:
+        response = app.response_class(status=304, headers=headers)
+        response.set_etag(etag)
+        return response
+    
+    response = app.response_class(payload['encodings'][encoding], mimetype=payload['mimetype'], headers=headers)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    return response
+
+def build_states_data(snapshot: 'AgronomySnapshot') -> Dict:
+    return {
+        'states': list(snapshot.states.keys()),
+        'districts': {state: data['districts'] for state, data in snapshot.states.items()},
+        'state_data': snapshot.states,
+        'languages': snapshot.languages,
+        'state_language_map': snapshot.state_language_map
+    }
+
+def encode_json(data) -> bytes:
+    return app.json.dump_bytes(data)
+
+def get_states_payload(fields: tuple = ()) -> Dict:
+    # Payloads are cached on the snapshot, so a data reload starts afresh
+    snapshot = get_agronomy()
+    payload = snapshot.states_payloads.get(fields)
+    if payload is None:
+        data = build_states_data(snapshot)
+        if fields:
+            data = {field: data[field] for field in fields}
+        payload = build_precompressed(encode_json(data))
+        snapshot.states_payloads[fields] = payload
+    return payload
+
+def get_state_payload(state: str) -> Optional[Dict]:
+    snapshot = get_agronomy()
+    state_info = snapshot.states.get(state)
+    if state_info is None:
+        return None
+    key = ('state', state)
+    payload = snapshot.states_payloads.get(key)
+    if payload is None:
+        payload = build_precompressed(encode_json({
+            'state': state,
+            'state_data': state_info,
+            'language': snapshot.state_language_map.get(state, 'english')
+        }))
+        snapshot.states_payloads[key] = payload
+    return payload
+
+def minify_css(text: str) -> str:
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    return re.sub(r'\s*([{};,])\s*', r'\1', text).replace(': ', ':').strip()
+
+def minify_lines(text: str, comment: Optional[str] = None) -> str:
+    # Drops indentation, blank lines and whole-line comments but keeps line
+    # breaks, so JavaScript semicolon insertion is unaffected.
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not (comment and line.startswith(comment)))
+
+def build_frontend() -> Dict:
+    # Returns {'index': payload, 'assets': {hashed name: payload}}
+    assets = {}
+    urls = {}
+    assets_dir = os.path.join(FRONTEND_DIR, 'assets')
+    for name in sorted(os.listdir(assets_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext not in ASSET_MIMETYPES:
+            continue
+        with open(os.path.join(assets_dir, name), encoding='utf-8') as f:
+            text = f.read()
+        text = minify_css(text) if ext == '.css' else minify_lines(text, '//')
+        body = text.encode('utf-8')
+        hashed_name = f'{stem}.{hashlib.sha256(body).hexdigest()[:12]}{ext}'
+        assets[hashed_name] = build_precompressed(body, ASSET_MIMETYPES[ext])
+        urls[f'/assets/{name}'] = f'/assets/{hashed_name}'
+    
+    with open(os.path.join(FRONTEND_DIR, 'index.html'), encoding='utf-8') as f:
+        html = minify_lines(f.read())
+    for url, hashed_url in urls.items():
+        html = html.replace(f'"{url}"', f'"{hashed_url}"')
+    return {'index': build_precompressed(html.encode('utf-8'), 'text/html'), 'assets': assets}
+
+frontend = build_frontend()
+
+# Rule engine index: crops are interned to integer IDs and every table is
+# compiled into a bitset (one bit per crop), so filtering is a few bitwise ops.
+def crop_mask(crop_ids: List[int]) -> int:
+    mask = 0
+    for crop_id in crop_ids:
+        mask |= 1 << crop_id
+    return mask
+
+def intern_crops(crop_ids: Dict, crops: List[str]) -> List[int]:
+    return [crop_ids.setdefault(crop, len(crop_ids)) for crop in crops]
+
+def build_rule_index(states_table: Dict, soil_table: Dict, seasonal_table: Dict) -> Dict:
+    crop_ids = {}
+    soils = {
+        soil_type: {
+            'primary': intern_crops(crop_ids, soil_data['primary']),
+            'secondary': intern_crops(crop_ids, soil_data['secondary'])
+        }
+        for soil_type, soil_data in soil_table.items()
+    }
+    seasons = {season: crop_mask(intern_crops(crop_ids, crops)) for season, crops in seasonal_table.items() if crops}
+    states = {}
+    for state, state_info in states_table.items():
+        ids = intern_crops(crop_ids, state_info['major_crops'])
+        states[state] = {'ids': ids, 'mask': crop_mask(ids)}
+    
+    return {
+        'crop_ids': crop_ids,
+        'crop_names': list(crop_ids),
+        'soils': soils,
+        'seasons': seasons,
+        'states': states,
+        'matches': {}
+    }
+
+# Location lookup: states and districts (plus aliases) are indexed by a
+# normalized name, with word-prefix keys for autocomplete and character
+# trigrams for fuzzy matching of misspellings.
+PLACE_STOPWORDS = {'district', 'dist', 'the'}
+
+def normalize_place(text: str) -> str:
+    text = str(text)
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    text = text.casefold().replace('&', ' and ')
+    words = ''.join(ch if ch.isalnum() else ' ' for ch in text).split()
+    return ' '.join(word for word in words if word not in PLACE_STOPWORDS)
+
+def place_trigrams(name: str) -> set:
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_location_index(states_table: Dict, state_aliases: Dict, district_aliases: Dict) -> Dict:
+    states = {normalize_place(state): state for state in states_table}
+    for alias, state in state_aliases.items():
+        if state in states_table:
+            states.setdefault(normalize_place(alias), state)
+    
+    districts = {}
+    entries = []
+    for state, state_info in states_table.items():
+        names = {}
+        labels = [(district, district) for district in state_info['districts']]
+        labels += [(alias, district) for alias, district in district_aliases.get(state, {}).items() if district in state_info['districts']]
+        for label, district in labels:
+            key = normalize_place(label)
+            if key and key not in names:
+                names[key] = district
+                entries.append({'key': key, 'state': state, 'district': district, 'label': label})
+        districts[state] = names
+    
+    prefixes = sorted(
+        (entry['key'][pos:], entry_id)
+        for entry_id, entry in enumerate(entries)
+        for pos in [0] + [i + 1 for i, ch in enumerate(entry['key']) if ch == ' ']
+    )
+    grams = {}
+    for entry_id, entry in enumerate(entries):
+        entry_grams = place_trigrams(entry['key'])
+        entry['grams'] = len(entry_grams)
+        for gram in entry_grams:
+            grams.setdefault(gram, []).append(entry_id)
+    
+    return {
+        'states': states,
+        'state_grams': [(place_trigrams(key), state) for key, state in states.items()],
+        'districts': districts,
+        'entries': entries,
+        'prefix_keys': [key for key, _ in prefixes],
+        'prefix_entries': [entry_id for _, entry_id in prefixes],
+        'grams': grams
+    }
+
+class AgronomySnapshot:
+    # One version of the agronomy tables with the indexes built from them. A
+    # reload replaces the whole object in one assignment and each request
+    # reads it once, so tables and indexes always come from the same version.
+    def __init__(self, version: str, tables: Dict):
+        self.version = version
+        self.tables = tables
+        self.state_language_map = tables['state_language_map']
+        self.languages = tables['languages']
+        self.states = tables['states']
+        self.soils = tables['soils']
+        self.seasons = tables['seasons']
+        self.rule_index = build_rule_index(self.states, self.soils, self.seasons)
+        self.states_payloads = {}
+        self._location_index = None
+        self._lock = threading.Lock()
+
+    @property
+    def location_index(self) -> Dict:
+        # Built on first lookup, keeping it out of worker boot
+        if self._location_index is None:
+            with self._lock:
+                if self._location_index is None:
+                    self._location_index = build_location_index(self.states, self.tables['state_aliases'], self.tables['district_aliases'])
+        return self._location_index
+
+def get_agronomy() -> AgronomySnapshot:
+    # Requests use the snapshot pinned by check_agronomy_reload; background
+    # threads and the CLI read the latest one
+    if has_request_context():
+        return g.get('agronomy') or agronomy
+    return agronomy
+
+agronomy = agronomy_store.load()
+get_states_payload()
+
+def get_location_index() -> Dict:
+    return get_agronomy().location_index
+
+def fuzzy_place_matches(key: str, state: Optional[str] = None) -> List[tuple]:
+    # Dice similarity over trigrams, best first: [(score, entry_id), ...]
+    index = get_location_index()
+    query_grams = place_trigrams(key)
+    shared = {}
+    for gram in query_grams:
+        for entry_id in index['grams'].get(gram, ()):
+            shared[entry_id] = shared.get(entry_id, 0) + 1
+    entries = index['entries']
+    scored = [
+        (2 * count / (len(query_grams) + entries[entry_id]['grams']), entry_id)
+        for entry_id, count in shared.items()
+        if state is None or entries[entry_id]['state'] == state
+    ]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored
+
+def resolve_state(text: str) -> Optional[str]:
+    index = get_location_index()
+    key = normalize_place(text)
+    state = index['states'].get(key)
+    if state is None and key:
+        query_grams = place_trigrams(key)
+        score, state = max(
+            ((2 * len(query_grams & grams) / (len(query_grams) + len(grams)), canonical) for grams, canonical in index['state_grams']),
+            default=(0, None)
+        )
+        if score < PLACE_MATCH_THRESHOLD:
+            state = None
+    return state
+
+def resolve_district(state: str, text: str) -> Optional[str]:
+    index = get_location_index()
+    key = normalize_place(text)
+    district = index['districts'].get(state, {}).get(key)
+    if district is None and key:
+        matches = fuzzy_place_matches(key, state)
+        if matches and matches[0][0] >= PLACE_MATCH_THRESHOLD:
+            district = index['entries'][matches[0][1]]['district']
+    return district
+
+def suggest_districts(state: str, text: str, limit: int = 3) -> List[str]:
+    entries = get_location_index()['entries']
+    suggestions = []
+    for score, entry_id in fuzzy_place_matches(normalize_place(text), state):
+        district = entries[entry_id]['district']
+        if score < PLACE_SUGGEST_THRESHOLD or len(suggestions) >= limit:
+            break
+        if district not in suggestions:
+            suggestions.append(district)
+    return suggestions
+
+def autocomplete_places(query: str, state: Optional[str] = None, limit: int = 10) -> List[Dict]:
+    # Word-prefix matches first (alphabetical), then fuzzy matches.
+    index = get_location_index()
+    key = normalize_place(query)
+    if not key:
+        return []
+    
+    entries = index['entries']
+    entry_ids = []
+    position = bisect.bisect_left(index['prefix_keys'], key)
+    while position < len(index['prefix_keys']) and index['prefix_keys'][position].startswith(key):
+        entry_id = index['prefix_entries'][position]
+        if state is None or entries[entry_id]['state'] == state:
+            entry_ids.append(entry_id)
+        position += 1
+    if len(entry_ids) < limit:
+        entry_ids.extend(entry_id for score, entry_id in fuzzy_place_matches(key, state) if score >= PLACE_SUGGEST_THRESHOLD)
+    
+    results = []
+    seen = set()
+    for entry_id in entry_ids:
+        entry = entries[entry_id]
+        place = (entry['state'], entry['district'])
+        if place in seen:
+            continue
+        seen.add(place)
+        result = {'state': entry['state'], 'district': entry['district']}
+        if entry['label'] != entry['district']:
+            result['alias'] = entry['label']
+        results.append(result)
+        if len(results) >= limit:
+            break
+    return results
+
+def reload_agronomy_tables() -> bool:
+    # The new snapshot arrives with its indexes built and is swapped in with
+    # one assignment. Its version is part of every cache key, so cached and
+    # precomputed recommendations for the old tables stop matching.
+    global agronomy
+    snapshot = agronomy_store.maybe_reload()
+    if snapshot is None:
+        return False
+    agronomy = snapshot
+    logger.info(f"Reloaded agronomy data version {snapshot.version}")
+    return True
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    # Revalidated on every visit (max-age=0) so new asset names take effect
+    return send_precompressed(frontend['index'], 0)
+
+@app.route('/assets/<name>')
+def asset(name):
+    payload = frontend['assets'].get(name)
+    if payload is None:
+        return jsonify({'error': 'Asset not found'}), 404
+    response = send_precompressed(payload, ASSET_MAX_AGE)
+    response.headers['Cache-Control'] += ', immutable'
+    return response
 
 @app.route('/states', methods=['GET'])
 def get_states():
-    states_list = list(INDIAN_STATES_DISTRICTS.keys())
-    districts_map = {state: data['districts'] for state, data in INDIAN_STATES_DISTRICTS.items()}
+    fields = tuple(field.strip() for field in request.args.get('fields', '').split(',') if field.strip())
+    invalid_fields = [field for field in fields if field not in STATES_FIELDS]
+    if invalid_fields:
+        return jsonify({
+            'error': f'Invalid fields: {", ".join(invalid_fields)}. Valid fields: {", ".join(STATES_FIELDS)}'
+        }), 400
     
-    return jsonify({
-        'states': states_list,
-        'districts': districts_map,
-        'state_data': INDIAN_STATES_DISTRICTS,
-        'languages': LANGUAGES,
-        'state_language_map': STATE_LANGUAGE_MAP
-    })
+    return send_precompressed(get_states_payload(tuple(sorted(set(fields)))), STATES_MAX_AGE)
+
+@app.route('/states/<path:state>', methods=['GET'])
+def get_state(state):
+    payload = get_state_payload(state)
+    if payload is None:
+        return jsonify({'error': f'Invalid state: {state}'}), 404
+    
+    return send_precompressed(payload, STATES_MAX_AGE)
+
+@app.route('/autocomplete', methods=['GET'])
+def autocomplete():
+    query = request.args.get('q', '')
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), AUTOCOMPLETE_MAX_RESULTS)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    state = request.args.get('state')
+    if state:
+        state = resolve_state(state)
+        if state is None:
+            return jsonify({'error': f'Invalid state: {request.args["state"]}'}), 400
+    
+    return jsonify({'query': query, 'results': autocomplete_places(query, state, limit)})
 
 @app.route('/recommend', methods=['POST'])
 def recommend():
     try:
-        data = request.form.to_dict()
+        with stage('form_parse'):
+            data = request.form.to_dict()
+            g.metric_data = data
         
-        required_fields = ['soil_type', 'state', 'district']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        if missing_fields:
-            return jsonify({
-                'error': f'Missing required fields: {", ".join(missing_fields)}'
-            }), 400
-        
-        state = data.get('state', '')
-        state_info = INDIAN_STATES_DISTRICTS.get(state, None)
-        
-        if not state_info:
-            return jsonify({
-                'error': f'Invalid state: {state}. Please select a valid Indian state.'
-            }), 400
+        with stage('validate'):
+            state_info, error_response = validate_recommendation_input(data)
+            if not error_response:
+                shape, error_response = get_response_shape()
+        if error_response:
+            return error_response
         
         language = data.get('language', 'english')
         
-        rule_suggestions = get_rule_based_suggestions(data, state_info)
-        prompt = build_enhanced_prompt(data, state_info, rule_suggestions, language)
-        ai_response = get_ai_recommendation(prompt)
+        with stage('rule_suggestions'):
+            rule_suggestions = get_rule_based_suggestions(data, state_info)
+        with stage('build_prompt'):
+            prompt = build_enhanced_prompt(data, state_info, rule_suggestions, language)
+        with stage('ai_recommendation'):
+            ai_response = get_recommendation_text(data, state_info, rule_suggestions, language, prompt)
         
         if ai_response is None:
-            return jsonify({
-                'error': 'Failed to get AI recommendation. Using rule-based suggestions.',
-                'rule_suggestions': rule_suggestions,
-                'state_info': state_info
-            }), 200
+            metrics.inc('crop_fallbacks_total', **get_metric_labels())
+            with stage('serialize'):
+                return jsonify(shape_response({
+                    'error': 'Failed to get AI recommendation. Using rule-based suggestions.',
+                    'rule_suggestions': rule_suggestions,
+                    'state_info': state_info
+                }, data['state'], shape)), 200
         
-        parsed_response = parse_ai_response(ai_response)
+        with stage('parse_response'):
+            parsed_response = parse_ai_response(ai_response)
         
-        return jsonify({
-            'success': True,
-            'ai_recommendation': parsed_response,
-            'rule_suggestions': rule_suggestions,
-            'state_info': state_info,
-            'inputs': sanitize_inputs(data),
-            'language': language
-        })
+        with stage('serialize'):
+            return jsonify(shape_response({
+                'success': True,
+                'ai_recommendation': parsed_response,
+                'rule_suggestions': rule_suggestions,
+                'state_info': state_info,
+                'inputs': sanitize_inputs(data),
+                'language': language
+            }, data['state'], shape))
         
     except Exception as e:
         logger.error(f"Error in recommend endpoint: {str(e)}")
@@ -424,25 +1545,341 @@ def recommend():
             'details': str(e) if app.debug else None
         }), 500
 
+@app.route('/recommend/stream', methods=['POST'])
+def recommend_stream():
+    data = request.form.to_dict()
+    
+    state_info, error_response = validate_recommendation_input(data)
+    if error_response:
+        return error_response
+    
+    language = data.get('language', 'english')
+    rule_suggestions = get_rule_based_suggestions(data, state_info)
+    prompt = build_enhanced_prompt(data, state_info, rule_suggestions, language)
+    cache_key = build_cache_key(data, language)
+    
+    def generate():
+        yield encode_ndjson({
+            'type': 'rule_suggestions',
+            'rule_suggestions': rule_suggestions,
+            'state_info': state_info,
+            'inputs': sanitize_inputs(data),
+            'language': language
+        })
+        
+        cached = recommendation_cache.get(cache_key)
+        parser = CropStreamParser()
+        parts = []
+        try:
+            for text in ([cached] if cached is not None else stream_ai_recommendation(prompt, get_output_token_budget(data, language))):
+                parts.append(text)
+                if cached is None:
+                    yield encode_ndjson({'type': 'token', 'text': text})
+                for crop in parser.feed(text):
+                    yield encode_ndjson({'type': 'crop', 'crop': crop})
+        except Exception as e:
+            logger.error(f"Streaming AI recommendation failed: {str(e)}")
+            parts = []
+        
+        ai_response = ''.join(parts)
+        if not ai_response:
+            yield encode_ndjson({'type': 'error', 'error': 'Failed to get AI recommendation. Using rule-based suggestions.'})
+            return
+        
+        if cached is None and is_cacheable_response(ai_response):
+            recommendation_cache.set(cache_key, ai_response)
+        yield encode_ndjson({'type': 'done', 'success': True, 'ai_recommendation': parse_ai_response(ai_response)})
+    
+    return app.response_class(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/recommend/batch', methods=['POST'])
+def recommend_batch():
+    body = request.get_json(silent=True)
+    rows = body.get('rows') if isinstance(body, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return jsonify({'error': 'Request body must be JSON with a "rows" list of objects'}), 400
+    if len(rows) > BATCH_MAX_ROWS:
+        return jsonify({'error': f'Too many rows: {len(rows)}. Maximum is {BATCH_MAX_ROWS}.'}), 400
+    
+    output_format = request.args.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'Invalid format. Use ndjson or csv.'}), 400
+    
+    rows = [{key: str(value) for key, value in row.items() if value is not None} for row in rows]
+    include_ai = parse_flag(body.get('ai', True))
+    if include_ai is None:
+        return jsonify({'error': 'ai must be true or false'}), 400
+    try:
+        start = max(0, int(body.get('start', 0) or 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'start must be an integer'}), 400
+    
+    def generate():
+        if output_format == 'csv':
+            yield format_batch_csv(None)
+        for result in run_batch(rows, include_ai, BATCH_CONCURRENCY, RateLimiter(BATCH_RATE_LIMIT), start):
+            yield format_batch_csv(result) if output_format == 'csv' else encode_ndjson(result)
+    
+    return app.response_class(
+        stream_with_context(generate()),
+        mimetype='text/csv' if output_format == 'csv' else 'application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/recommend/jobs', methods=['POST'])
+def create_recommendation_job():
+    data = request.form.to_dict()
+    state_info, error_response = validate_recommendation_input(data)
+    if not error_response:
+        shape, error_response = get_response_shape()
+    if error_response:
+        return error_response
+    try:
+        priority = min(max(int(data.pop('priority', JOBS_DEFAULT_PRIORITY)), 0), JOBS_MAX_PRIORITY)
+    except ValueError:
+        return jsonify({'error': f'priority must be an integer from 0 to {JOBS_MAX_PRIORITY}'}), 400
+    
+    language = data.get('language', 'english')
+    rule_suggestions = get_rule_based_suggestions(data, state_info)
+    try:
+        # Jobs are shared by everyone submitting the same inputs, so only the
+        # fields that shape the answer are stored, never e.g. the farmer's name
+        job_data = {field: data[field] for field in CACHE_KEY_FIELDS + ['language'] if data.get(field)}
+        job = job_queue.submit(build_cache_key(data, language), job_data, language, priority)
+    except sqlite3.Error as e:
+        logger.error(f"Job submission failed: {str(e)}")
+        job = None
+    if job is None:
+        metrics.inc('crop_fallbacks_total', **get_metric_labels())
+        return jsonify(shape_response({
+            'error': 'Recommendation queue is unavailable. Using rule-based suggestions.',
+            'rule_suggestions': rule_suggestions,
+            'state_info': state_info
+        }, data['state'], shape)), 200
+    
+    response = jsonify(shape_response(format_job(job, rule_suggestions, sanitize_inputs(data)), data['state'], shape))
+    response.status_code = 200 if job['status'] == 'done' else 202
+    response.headers['Location'] = f"/recommend/jobs/{job['id']}"
+    return response
+
+@app.route('/recommend/jobs/<job_id>', methods=['GET'])
+def get_recommendation_job(job_id):
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), JOBS_MAX_WAIT)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
+    shape, error_response = get_response_shape()
+    if error_response:
+        return error_response
+    
+    job = job_queue.wait(job_id, wait) if wait else job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    
+    state_info = get_agronomy().states.get(job['data']['state'])
+    rule_suggestions = get_rule_based_suggestions(job['data'], state_info) if state_info else None
+    return jsonify(shape_response(format_job(job, rule_suggestions), job['data']['state'], shape))
+
+def format_job(job: Dict, rule_suggestions: Optional[Dict], inputs: Optional[Dict] = None) -> Dict:
+    # `inputs` echoes the current request's own form; stored job data is
+    # shared between submitters and is never echoed
+    result = {
+        'id': job['id'],
+        'status': job['status'],
+        'priority': job['priority'],
+        'rule_suggestions': rule_suggestions,
+        'language': job['language']
+    }
+    if inputs is not None:
+        result['inputs'] = inputs
+    if job['status'] == 'queued':
+        result['position'] = job['position']
+    elif job['status'] == 'done':
+        result['success'] = True
+        result['ai_recommendation'] = app.json.loads(job['result'])
+    elif job['status'] == 'failed':
+        result['error'] = 'Failed to get AI recommendation. Using rule-based suggestions.'
+        result['details'] = job['error']
+    return result
+
+# Response shaping. `fields` and `omit` take comma-separated paths such as
+# ai_recommendation.recommended_crops(name,benefits); lists are traversed
+# automatically and a trailing [] on a name is accepted.
+FIELD_NAME = re.compile(r'([A-Za-z0-9_]+)(?:\[\])?')
+COMPACT_OMITTED = ('state_info', 'inputs')
+COMPACT_RULE_OMITTED = ('state_climate', 'state_rainfall')
+
+def parse_field_selector(text: str) -> Dict:
+    # Returns a tree of {name: subtree}; a None subtree means the whole value
+    text = ''.join(text.split())
+    tree, pos = parse_field_list(text, 0)
+    if pos != len(text):
+        raise ValueError(f'unexpected {text[pos]!r} at position {pos}')
+    return tree
+
+def parse_field_list(text: str, pos: int) -> tuple:
+    tree = {}
+    while True:
+        name, subtree, pos = parse_field_item(text, pos)
+        merge_field_tree(tree, name, subtree)
+        if not text.startswith(',', pos):
+            return tree, pos
+        pos += 1
+
+def parse_field_item(text: str, pos: int) -> tuple:
+    match = FIELD_NAME.match(text, pos)
+    if not match:
+        raise ValueError(f'expected a field name at position {pos}')
+    name, pos = match.group(1), match.end()
+    if text.startswith('.', pos):
+        child, child_tree, pos = parse_field_item(text, pos + 1)
+        return name, {child: child_tree}, pos
+    if text.startswith('(', pos):
+        subtree, pos = parse_field_list(text, pos + 1)
+        if not text.startswith(')', pos):
+            raise ValueError(f'expected ")" at position {pos}')
+        return name, subtree, pos + 1
+    return name, None, pos
+
+def merge_field_tree(tree: Dict, name: str, subtree: Optional[Dict]) -> None:
+    if name not in tree:
+        tree[name] = subtree
+    elif tree[name] is None or subtree is None:
+        tree[name] = None
+    else:
+        for child, child_tree in subtree.items():
+            merge_field_tree(tree[name], child, child_tree)
+
+def select_fields(value, tree: Optional[Dict]):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: select_fields(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+def omit_fields(value, tree: Dict):
+    if isinstance(value, list):
+        return [omit_fields(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: omit_fields(item, tree[key]) if key in tree else item
+        for key, item in value.items()
+        if key not in tree or tree[key] is not None
+    }
+
+def parse_response_shape(args) -> Dict:
+    return {
+        'compact': args.get('compact', '').lower() in ('1', 'true', 'yes'),
+        'omit': parse_field_selector(args['omit']) if args.get('omit') else None,
+        'fields': parse_field_selector(args['fields']) if args.get('fields') else None
+    }
+
+def get_response_shape():
+    # Returns (shape, error_response) for the compact/omit/fields query parameters
+    try:
+        return parse_response_shape(request.args), None
+    except ValueError as e:
+        return None, (jsonify({'error': f'Invalid fields or omit parameter: {str(e)}'}), 400)
+
+def shape_response(payload: Dict, state: str, shape: Dict) -> Dict:
+    # Compact mode refers to the state by name (its ID in /states/<state>)
+    # instead of embedding it, and drops the input echo and the state fields
+    # repeated in the rule suggestions.
+    if shape['compact']:
+        payload = {'state': state, **{key: value for key, value in payload.items() if key not in COMPACT_OMITTED}}
+        if payload.get('rule_suggestions'):
+            payload['rule_suggestions'] = {key: value for key, value in payload['rule_suggestions'].items() if key not in COMPACT_RULE_OMITTED}
+    if shape['omit']:
+        payload = omit_fields(payload, shape['omit'])
+    if shape['fields']:
+        # Errors are always kept so a fallback is never mistaken for an empty result
+        payload = {**select_fields(payload, shape['fields']), **({'error': payload['error']} if 'error' in payload else {})}
+    return payload
+
+def validate_recommendation_input(data: Dict):
+    error = check_recommendation_input(data)
+    if error:
+        return None, (jsonify({'error': error}), 400)
+    
+    return get_agronomy().states[data['state']], None
+
+def check_recommendation_input(data: Dict) -> Optional[str]:
+    # Also rewrites state and district to their canonical names, so spelling
+    # variants share one prompt and cache entry.
+    required_fields = ['soil_type', 'state', 'district']
+    missing_fields = [field for field in required_fields if not data.get(field)]
+    if missing_fields:
+        return f'Missing required fields: {", ".join(missing_fields)}'
+    
+    state = resolve_state(data['state'])
+    if state is None:
+        return f'Invalid state: {data["state"]}. Please select a valid Indian state.'
+    
+    district = resolve_district(state, data['district'])
+    if district is None:
+        suggestions = suggest_districts(state, data['district'])
+        hint = f' Did you mean: {", ".join(suggestions)}?' if suggestions else ''
+        return f'Invalid district: {data["district"]} is not a district of {state}.{hint}'
+    
+    data['state'] = state
+    data['district'] = district
+    return None
+
+def encode_ndjson(event: Dict) -> bytes:
+    return encode_json(event) + b'\n'
+
+def match_rule_crops(index: Dict, soil_type: str, season: str, state_name: str, major_crops: List[str]) -> tuple:
+    memo_key = (soil_type, season, state_name)
+    matched = index['matches'].get(memo_key)
+    if matched is not None:
+        return matched
+    
+    crop_names = index['crop_names']
+    state = index['states'].get(state_name)
+    if state is None:
+        crop_ids = dict(index['crop_ids'])
+        ids = intern_crops(crop_ids, major_crops)
+        crop_names = list(crop_ids)
+        state = {'ids': ids, 'mask': crop_mask(ids)}
+    
+    soil = index['soils'].get(soil_type, {'primary': [], 'secondary': []})
+    season_mask = index['seasons'].get(season)
+    allowed = season_mask | state['mask'] if season_mask is not None else -1
+    primary_ids = [crop_id for crop_id in soil['primary'] if allowed >> crop_id & 1]
+    secondary_ids = [crop_id for crop_id in soil['secondary'] if allowed >> crop_id & 1]
+    primary_mask = crop_mask(primary_ids)
+    state_ids = [crop_id for crop_id in state['ids'] if not primary_mask >> crop_id & 1][:3]
+    
+    matched = (
+        tuple(crop_names[crop_id] for crop_id in primary_ids),
+        tuple(crop_names[crop_id] for crop_id in secondary_ids),
+        tuple(crop_names[crop_id] for crop_id in state_ids)
+    )
+    # Only table states are memoized, which keeps the memo bounded by the
+    # known soil x season x state combinations plus unknown soil/season spellings.
+    if state_name in index['states'] and len(index['matches']) < RULE_MATCH_MEMO_SIZE:
+        index['matches'][memo_key] = matched
+    return matched
+
 def get_rule_based_suggestions(data: Dict, state_info: Dict) -> Dict:
     soil_type = data.get('soil_type', '').lower()
     season = data.get('season', '').lower()
     
-    soil_data = SOIL_CROP_DB.get(soil_type, {})
-    primary_crops = soil_data.get('primary', [])
-    secondary_crops = soil_data.get('secondary', [])
-    
-    seasonal_crops = SEASONAL_CROPS.get(season, [])
-    if seasonal_crops:
-        primary_crops = [c for c in primary_crops if c in seasonal_crops or c in state_info['major_crops']]
-        secondary_crops = [c for c in secondary_crops if c in seasonal_crops or c in state_info['major_crops']]
-    
-    state_crops = [c for c in state_info['major_crops'] if c not in primary_crops][:3]
+    snapshot = get_agronomy()
+    primary_crops, secondary_crops, state_crops = match_rule_crops(snapshot.rule_index, soil_type, season, data.get('state', ''), state_info['major_crops'])
+    soil_data = snapshot.soils.get(soil_type, {})
     
     return {
-        'primary_crops': primary_crops,
-        'secondary_crops': secondary_crops,
-        'state_specific_crops': state_crops,
+        'primary_crops': list(primary_crops),
+        'secondary_crops': list(secondary_crops),
+        'state_specific_crops': list(state_crops),
         'soil_characteristics': soil_data.get('characteristics', 'N/A'),
         'soil_improvement': soil_data.get('improvement', 'N/A'),
         'season': season or 'Not specified',
@@ -450,128 +1887,1113 @@ def get_rule_based_suggestions(data: Dict, state_info: Dict) -> Dict:
         'state_rainfall': state_info['rainfall']
     }
 
+def get_rule_based_suggestions_batch(rows: List[Dict]) -> List[Optional[Dict]]:
+    # Rows sharing state/soil/season share one (read-only) result dict; rows
+    # with an unknown state get None.
+    results = []
+    computed = {}
+    states = get_agronomy().states
+    for data in rows:
+        key = (data.get('state', ''), data.get('soil_type', '').lower(), data.get('season', '').lower())
+        if key not in computed:
+            state_info = states.get(key[0])
+            computed[key] = get_rule_based_suggestions(data, state_info) if state_info else None
+        results.append(computed[key])
+    return results
+
+class RateLimiter:
+    # Spaces calls evenly at `rate` per second across threads; 0 disables it.
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_at)
+            self._next_at = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+def parse_flag(value) -> Optional[bool]:
+    # Accepts JSON booleans as well as the usual string and 0/1 spellings
+    if isinstance(value, str):
+        value = value.strip().lower()
+    if value in (True, 1, '1', 'true', 'yes'):
+        return True
+    if value in (False, 0, '0', 'false', 'no'):
+        return False
+    return None
+
+def run_batch(rows: List[Dict], include_ai: bool, concurrency: int, rate_limiter: Optional[RateLimiter] = None, start: int = 0):
+    # Yields one result per row in input order. Rows with identical inputs
+    # share a single AI lookup; each upstream call waits on the rate limiter.
+    rows = rows[start:]
+    states = get_agronomy().states
+    errors = [check_recommendation_input(data) for data in rows]
+    suggestions = get_rule_based_suggestions_batch(rows)
+    
+    # Shut down without waiting when the consumer stops early (e.g. a client
+    # disconnect closes the generator) so queued AI calls are cancelled.
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        ai_futures = {}
+        pending = []
+        for offset, (data, rule_suggestions, error) in enumerate(zip(rows, suggestions, errors)):
+            language = data.get('language', 'english')
+            future = None
+            if include_ai and not error:
+                key = build_cache_key(data, language)
+                future = ai_futures.get(key)
+                if future is None:
+                    state_info = states[data['state']]
+                    prompt = build_enhanced_prompt(data, state_info, rule_suggestions, language)
+                    future = executor.submit(get_recommendation_text, data, state_info, rule_suggestions, language, prompt, rate_limiter)
+                    ai_futures[key] = future
+            pending.append((start + offset, data, language, rule_suggestions, error, future))
+        
+        for row, data, language, rule_suggestions, error, future in pending:
+            if error:
+                yield {'row': row, 'error': error, 'inputs': sanitize_inputs(data)}
+                continue
+            
+            result = {
+                'row': row,
+                'success': True,
+                'rule_suggestions': rule_suggestions,
+                'inputs': sanitize_inputs(data),
+                'language': language
+            }
+            if future is not None:
+                try:
+                    ai_response = future.result()
+                except Exception as e:
+                    logger.error(f"Batch row {row} failed: {str(e)}")
+                    ai_response = None
+                if ai_response is None:
+                    result['error'] = 'Failed to get AI recommendation. Using rule-based suggestions.'
+                else:
+                    result['ai_recommendation'] = parse_ai_response(ai_response)
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def format_batch_csv(result: Optional[Dict]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if result is None:
+        writer.writerow(BATCH_CSV_FIELDS)
+        return buffer.getvalue().encode('utf-8')
+    
+    inputs = result.get('inputs', {})
+    rule_suggestions = result.get('rule_suggestions', {})
+    crops = (result.get('ai_recommendation') or {}).get('recommended_crops') or []
+    writer.writerow([
+        result['row'],
+        inputs.get('state', ''),
+        inputs.get('district', ''),
+        inputs.get('soil_type', ''),
+        inputs.get('season', ''),
+        result.get('language', ''),
+        '; '.join(rule_suggestions.get('primary_crops', [])),
+        '; '.join(rule_suggestions.get('secondary_crops', [])),
+        '; '.join(rule_suggestions.get('state_specific_crops', [])),
+        '; '.join(str(crop.get('name', '')) for crop in crops if isinstance(crop, dict)),
+        result.get('error', '')
+    ])
+    return buffer.getvalue().encode('utf-8')
+
+class JobQueue:
+    # Persistent priority queue of recommendation jobs. A job's ID is derived
+    # from its cache key, so identical submissions share one job. Workers
+    # claim the highest-priority runnable job under a lease; a job whose
+    # worker died is picked up again once the lease expires.
+    def __init__(self, db_path: str, handler, workers: int, max_queued: int, max_attempts: int,
+                 lease_seconds: float, result_ttl: float, poll_interval: float):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.submitted = 0
+        self.deduplicated = 0
+        self._threads = []
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _ensure_schema(self) -> None:
+        if self._initialized:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, '
+                'data TEXT NOT NULL, language TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, '
+                'created_at REAL NOT NULL, available_at REAL NOT NULL, lease_until REAL, finished_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_runnable ON jobs (status, priority DESC, created_at)')
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            self._ensure_schema()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'job-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Started {self.workers} job workers on {self.db_path}")
+
+    def submit(self, key: str, data: Dict, language: str, priority: int) -> Optional[Dict]:
+        # Returns the job, or None when the queue is full
+        self.start()
+        self._ensure_schema()
+        job_id = key[:32]
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT status, finished_at FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            reusable = row is not None and (row[0] in ('queued', 'running') or (row[0] == 'done' and row[1] > now - self.result_ttl))
+            if reusable:
+                conn.execute('UPDATE jobs SET priority = MAX(priority, ?) WHERE id = ?', (priority, job_id))
+            elif conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0] >= self.max_queued:
+                conn.execute('ROLLBACK')
+                return None
+            else:
+                conn.execute(
+                    'INSERT OR REPLACE INTO jobs (id, status, priority, data, language, created_at, available_at) '
+                    "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                    (job_id, priority, app.json.dumps(data), language, now, now)
+                )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        
+        with self._lock:
+            if reusable:
+                self.deduplicated += 1
+            else:
+                self.submitted += 1
+        with self._changed:
+            self._changed.notify_all()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        self._ensure_schema()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT id, status, priority, data, language, result, error, attempts, created_at, finished_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = dict(zip(('id', 'status', 'priority', 'data', 'language', 'result', 'error', 'attempts', 'created_at', 'finished_at'), row))
+            if job['status'] == 'queued':
+                job['position'] = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (priority > ? OR (priority = ? AND created_at < ?))",
+                    (job['priority'], job['priority'], job['created_at'])
+                ).fetchone()[0]
+        finally:
+            conn.close()
+        job['data'] = app.json.loads(job['data'])
+        return job
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        # Long poll: returns as soon as the job is done or failed, or when
+        # `timeout` runs out. Jobs finished by other processes are noticed
+        # within one poll interval.
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in ('done', 'failed') or remaining <= 0:
+                return job
+            with self._changed:
+                self._changed.wait(min(self.poll_interval, remaining))
+
+    def _claim(self) -> Optional[tuple]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                "SELECT id, data, language, attempts FROM jobs WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY priority DESC, created_at LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                    (now + self.lease_seconds, row[0])
+                )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return row
+
+    def _finish(self, job_id: str, attempts: int, result: Optional[str], error: Optional[str]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            if result is not None:
+                conn.execute("UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ? WHERE id = ?", (result, now, job_id))
+            elif attempts < self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, lease_until = NULL WHERE id = ?",
+                    (error, now + get_backoff_delay(None, attempts) + (CIRCUIT_RESET_TIMEOUT if circuit_breaker.state == 'open' else 0), job_id)
+                )
+            else:
+                conn.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?", (error, now, job_id))
+            if random.random() < 0.01:
+                conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (now - self.result_ttl,))
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                claimed = self._claim()
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue read failed: {str(e)}")
+                claimed = None
+            if claimed is None:
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+                continue
+            
+            job_id, data, language, attempts = claimed
+            attempts += 1
+            try:
+                result, error = self.handler(app.json.loads(data), language), None
+            except Exception as e:
+                logger.error(f"Job {job_id} attempt {attempts} failed: {str(e)}")
+                result, error = None, str(e)
+            try:
+                self._finish(job_id, attempts, result, error)
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue write failed for {job_id}: {str(e)}")
+
+    def stats(self) -> Dict:
+        counts = {}
+        if self._initialized:
+            try:
+                conn = self._connect()
+                try:
+                    counts = dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue stats failed: {str(e)}")
+        with self._lock:
+            return {
+                'workers': len(self._threads),
+                'submitted': self.submitted,
+                'deduplicated': self.deduplicated,
+                **{status: counts.get(status, 0) for status in ('queued', 'running', 'done', 'failed')}
+            }
+
+def run_recommendation_job(data: Dict, language: str) -> str:
+    # Returns the parsed AI recommendation as JSON; raises so the queue retries
+    error = check_recommendation_input(data)
+    if error:
+        raise ValueError(error)
+    state_info = get_agronomy().states[data['state']]
+    rule_suggestions = get_rule_based_suggestions(data, state_info)
+    prompt = build_enhanced_prompt(data, state_info, rule_suggestions, language)
+    ai_response = get_recommendation_text(data, state_info, rule_suggestions, language, prompt)
+    if ai_response is None:
+        raise RuntimeError('Failed to get AI recommendation')
+    return app.json.dumps(parse_ai_response(ai_response))
+
+job_queue = JobQueue(
+    JOBS_DB, run_recommendation_job, JOBS_WORKERS, JOBS_MAX_QUEUED, JOBS_MAX_ATTEMPTS,
+    JOBS_LEASE_SECONDS, JOBS_RESULT_TTL, JOBS_POLL_INTERVAL
+)
+
+def run_batch_cli(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py batch', description='Generate recommendations for every row of a CSV file.')
+    parser.add_argument('input', help='CSV file with state, district, soil_type, season, ... columns')
+    parser.add_argument('--output', help='Output file (default: <input>.results.<format>)')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--no-ai', action='store_true', help='Only run the rule engine')
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=BATCH_RATE_LIMIT, help='Maximum Gemini calls per second')
+    args = parser.parse_args(argv)
+    
+    with open(args.input, newline='', encoding='utf-8') as f:
+        rows = [{key: value for key, value in row.items() if key and value} for row in csv.DictReader(f)]
+    
+    output_path = args.output or f'{os.path.splitext(args.input)[0]}.results.{args.format}'
+    checkpoint_path = output_path + '.checkpoint'
+    
+    # Resume from the last checkpoint, dropping anything written after it
+    start, offset = 0, 0
+    if os.path.exists(checkpoint_path) and os.path.exists(output_path):
+        with open(checkpoint_path, encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        start, offset = checkpoint['completed'], checkpoint['offset']
+        logger.info(f"Resuming batch from row {start}")
+    
+    def save_checkpoint(completed: int, position: int) -> None:
+        with open(checkpoint_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'completed': completed, 'offset': position}, f)
+        os.replace(checkpoint_path + '.tmp', checkpoint_path)
+    
+    with open(output_path, 'ab') as out:
+        out.truncate(offset)
+        out.seek(offset)
+        if args.format == 'csv' and offset == 0:
+            out.write(format_batch_csv(None))
+        
+        completed = start
+        for result in run_batch(rows, not args.no_ai, args.concurrency, RateLimiter(args.rate), start):
+            out.write(format_batch_csv(result) if args.format == 'csv' else encode_ndjson(result))
+            completed = result['row'] + 1
+            if completed % BATCH_CHECKPOINT_EVERY == 0:
+                out.flush()
+                save_checkpoint(completed, out.tell())
+        out.flush()
+    
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    logger.info(f"Wrote {completed} of {len(rows)} rows to {output_path}")
+
+def enumerate_warm_combinations(states: List[str], all_languages: bool) -> List[tuple]:
+    # Soil choices are pruned to the soils each state actually has; languages
+    # default to English plus the state's own language. Irrigation is always
+    # set because the form has no blank option, while the optional inputs stay
+    # blank as the form posts them.
+    combinations = []
+    snapshot = get_agronomy()
+    for state in states:
+        state_info = snapshot.states[state]
+        soils = [soil for soil in state_info['soil_types'] if soil in snapshot.soils]
+        languages = list(snapshot.languages) if all_languages else list(dict.fromkeys(['english', snapshot.state_language_map.get(state, 'english')]))
+        for district in state_info['districts']:
+            for soil_type in soils:
+                for season in snapshot.seasons:
+                    for irrigation in IRRIGATION_OPTIONS:
+                        for language in languages:
+                            data = {'state': state, 'district': district, 'soil_type': soil_type, 'season': season, 'irrigation': irrigation, 'language': language}
+                            combinations.append((build_cache_key(data, language), data, language))
+    return combinations
+
+def build_warm_report(combinations: List[tuple], created_at: Dict, max_age: float) -> Dict:
+    now = time.time()
+    ages = [now - created_at[key] for key, _, _ in combinations if key in created_at]
+    fresh = sum(1 for age in ages if age < max_age)
+    return {
+        'combinations': len(combinations),
+        'stored': len(ages),
+        'fresh': fresh,
+        'stale': len(ages) - fresh,
+        'missing': len(combinations) - len(ages),
+        'coverage': round(fresh / len(combinations), 4) if combinations else 0.0,
+        'oldest_age_hours': round(max(ages) / 3600, 1) if ages else None
+    }
+
+def run_compile_data_cli(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py compile-data', description='Compile the agronomy data file for the service to memory-map.')
+    parser.add_argument('--source', default=AGRONOMY_DATA_PATH)
+    parser.add_argument('--output', default=AGRONOMY_DB_PATH)
+    args = parser.parse_args(argv)
+    
+    try:
+        digest = compile_agronomy_data(args.source, args.output)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        parser.error(str(e))
+    print(f'Compiled {args.source} (version {digest}) to {args.output}')
+
+def run_warm_cli(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py warm', description='Precompute AI recommendations for likely inputs.')
+    parser.add_argument('--state', action='append', help='Only warm this state (repeatable)')
+    parser.add_argument('--all-languages', action='store_true', help='Warm every supported language, not just English and the state language')
+    parser.add_argument('--rate', type=float, default=WARM_RATE_LIMIT, help='Maximum Gemini calls per second')
+    parser.add_argument('--limit', type=int, help='Maximum Gemini calls in this run')
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument('--report', action='store_true', help='Only print coverage and staleness')
+    args = parser.parse_args(argv)
+    
+    if not precomputed_store.db_path:
+        parser.error('Set PRECOMPUTED_DB to the SQLite file the service reads')
+    states = get_agronomy().states
+    invalid_states = [state for state in args.state or [] if state not in states]
+    if invalid_states:
+        parser.error(f'Invalid state(s): {", ".join(invalid_states)}')
+    
+    combinations = enumerate_warm_combinations(args.state or list(states), args.all_languages)
+    created_at = precomputed_store.created_at()
+    if not args.report:
+        cutoff = time.time() - precomputed_store.max_age
+        todo = [combination for combination in combinations if created_at.get(combination[0], 0) <= cutoff]
+        todo = todo[:args.limit] if args.limit is not None else todo
+        logger.info(f"Warming {len(todo)} of {len(combinations)} combinations")
+        rate_limiter = RateLimiter(args.rate)
+        
+        def warm(combination: tuple) -> bool:
+            key, data, language = combination
+            state_info = states[data['state']]
+            prompt = build_enhanced_prompt(data, state_info, get_rule_based_suggestions(data, state_info), language)
+            rate_limiter.wait()
+            ai_response = get_ai_recommendation(prompt, max_output_tokens=get_output_token_budget(data, language))
+            if ai_response is None or not is_cacheable_response(ai_response):
+                return False
+            precomputed_store.put(key, data, language, ai_response)
+            return True
+        
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            succeeded = sum(executor.map(warm, todo))
+        logger.info(f"Warmed {succeeded} combinations, {len(todo) - succeeded} failed")
+        created_at = precomputed_store.created_at()
+    
+    print(json.dumps(build_warm_report(combinations, created_at, precomputed_store.max_age), indent=2))
+
 def build_enhanced_prompt(data: Dict, state_info: Dict, rule_suggestions: Dict, language: str) -> str:
     language_instruction = ""
     if language != 'english':
-        lang_name = LANGUAGES.get(language, {}).get('name', language)
-        language_instruction = f"\n\nIMPORTANT: Provide ALL recommendations, explanations, and text content in {lang_name} language. The JSON structure should remain in English, but all values, descriptions, and text should be in {lang_name}."
-    
-    prompt = f"""You are an agricultural expert specializing in Indian farming practices.
-
-STATE INFORMATION - {data.get('state', 'N/A')} / {data.get('district', 'N/A')}:
-- Climate: {state_info['climate']}
-- Average Rainfall: {state_info['rainfall']}
-- Major Crops: {', '.join(state_info['major_crops'])}
-- Common Soil Types: {', '.join(state_info['soil_types'])}
-
-FARMER'S INPUT DATA:
-- State: {data.get('state', 'Not specified')}
-- District: {data.get('district', 'Not specified')}
-- Soil Type: {data.get('soil_type', 'Not specified')}
-- Season: {data.get('season', 'Not specified')}
-- Farm Size: {data.get('farm_size', 'Not specified')} acres
-- Irrigation: {data.get('irrigation', 'Not specified')}
-- Budget: ₹{data.get('budget', 'Not specified')}
-- Previous Crop: {data.get('previous_crop', 'Not specified')}
-
-RULE-BASED ANALYSIS:
-- Soil Characteristics: {rule_suggestions['soil_characteristics']}
-- Soil Improvement Tips: {rule_suggestions['soil_improvement']}
-- Primary Crops for Soil: {', '.join(rule_suggestions['primary_crops'])}
-- State-Specific Crops: {', '.join(rule_suggestions['state_specific_crops'])}
-
-{language_instruction}
-
-TASK: Provide detailed crop recommendations in the following EXACT JSON structure:
-
-{{
-  "recommended_crops": [
-    {{
-      "name": "Crop Name",
-      "climate_suitability": "Explanation of why this crop suits the climate",
-      "water_requirement": "Detailed water needs (e.g., 600-800mm, irrigation frequency)",
-      "growth_cycle": {{
-        "duration": "Total duration from sowing to harvest",
-        "stages": "Key growth stages and their duration",
-        "critical_periods": "When crop needs most attention"
-      }},
-      "benefits": {{
-        "yield_potential": "Expected yield per acre",
-        "market_demand": "Current market situation",
-        "profitability": "Income potential and ROI",
-        "nutritional_value": "If applicable",
-        "other_benefits": "Soil improvement, short duration, etc."
-      }},
-      "cultivation_practices": {{
-        "sowing_time": "Best time to sow",
-        "seed_rate": "Seeds needed per acre",
-        "spacing": "Row to row and plant to plant distance",
-        "fertilizers": "NPK requirements and application schedule",
-        "pest_diseases": "Common issues and prevention"
-      }}
-    }}
-  ]
-}}
-
-Provide 3-5 most suitable crops. Respond ONLY with valid JSON, no additional text."""
+        lang_name = get_agronomy().languages.get(language, {}).get('name', language)
+        language_instruction = f"\nIMPORTANT: Write ALL text values in {lang_name}. Keep the JSON keys in English."
+    
+    crop_count = get_crop_count(data)
+    crops_wanted = f'the {crop_count}' if crop_count else '3-5'
+    
+    # The instructions come first so every prompt shares the same prefix
+    prompt = f"""{RECOMMENDATION_INSTRUCTIONS}
+
+STATE: {data.get('state', 'N/A')} / {data.get('district', 'N/A')}; climate: {state_info['climate']}; rainfall: {state_info['rainfall']}; major crops: {', '.join(state_info['major_crops'])}; soils: {', '.join(state_info['soil_types'])}
+FARM: soil: {data.get('soil_type', 'Not specified')}; season: {data.get('season', 'Not specified')}; size: {data.get('farm_size', 'Not specified')} acres; irrigation: {data.get('irrigation', 'Not specified')}; budget: ₹{data.get('budget', 'Not specified')}; previous crop: {data.get('previous_crop', 'Not specified')}
+RULES: soil: {rule_suggestions['soil_characteristics']}; improve: {rule_suggestions['soil_improvement']}; soil crops: {', '.join(rule_suggestions['primary_crops'])}; state crops: {', '.join(rule_suggestions['state_specific_crops'])}
+Provide {crops_wanted} most suitable crops.{language_instruction}"""
 
     return prompt
 
-def get_ai_recommendation(prompt: str, max_retries: int = 3) -> Optional[str]:
-    for attempt in range(max_retries):
+def get_crop_count(data: Dict) -> Optional[int]:
+    try:
+        return min(max(int(data.get('crop_count', '')), 1), DEFAULT_CROP_COUNT)
+    except ValueError:
+        return None
+
+def get_output_token_budget(data: Dict, language: str) -> int:
+    tokens = TOKENS_OVERHEAD + TOKENS_PER_CROP * (get_crop_count(data) or DEFAULT_CROP_COUNT)
+    if language != 'english':
+        tokens *= NON_ENGLISH_TOKEN_FACTOR
+    return min(int(tokens), GENERATION_CONFIG['max_output_tokens'])
+
+class TokenUsage:
+    # Prompt/output token and generation time accounting. Token counts come
+    # from the response when the SDK reports them and are estimated otherwise.
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.generation_seconds = 0.0
+        self.estimated = 0
+        self._lock = threading.Lock()
+
+    def record(self, prompt: str, text: str, seconds: float, response=None) -> Dict:
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            prompt_tokens = usage.prompt_token_count
+            output_tokens = usage.candidates_token_count
+            estimated = False
+        else:
+            candidates = getattr(response, 'candidates', None) or []
+            prompt_tokens = estimate_tokens(prompt)
+            output_tokens = sum(getattr(candidate, 'token_count', 0) for candidate in candidates) or estimate_tokens(text)
+            estimated = True
+        
+        metrics.inc('crop_gemini_tokens_total', prompt_tokens, kind='prompt')
+        metrics.inc('crop_gemini_tokens_total', output_tokens, kind='output')
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+            self.generation_seconds += seconds
+            self.estimated += estimated
+        logger.info(f"Gemini usage: {prompt_tokens} prompt tokens, {output_tokens} output tokens, {seconds:.2f}s{' (estimated)' if estimated else ''}")
+        return {'prompt_tokens': prompt_tokens, 'output_tokens': output_tokens, 'seconds': seconds}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'output_tokens': self.output_tokens,
+                'avg_prompt_tokens': round(self.prompt_tokens / self.calls, 1) if self.calls else 0,
+                'avg_output_tokens': round(self.output_tokens / self.calls, 1) if self.calls else 0,
+                'avg_generation_seconds': round(self.generation_seconds / self.calls, 3) if self.calls else 0,
+                'estimated_calls': self.estimated
+            }
+
+def estimate_tokens(text: str) -> int:
+    # About 4 bytes per token for English; UTF-8 Indic text scales up with it
+    return max(1, len(text.encode('utf-8')) // 4)
+
+token_usage = TokenUsage()
+
+def build_generation_config(max_output_tokens: Optional[int] = None) -> Dict:
+    load_gemini_sdk()
+    return dict(GENERATION_CONFIG, max_output_tokens=max_output_tokens or GENERATION_CONFIG['max_output_tokens'])
+
+def get_ai_recommendation(prompt: str, max_retries: int = 3, max_output_tokens: Optional[int] = None) -> Optional[str]:
+    allowed, probe = circuit_breaker.allow_request()
+    if not allowed:
+        logger.warning("Gemini circuit breaker open, skipping AI call")
+        return None
+    if not upstream_limiter.acquire():
+        if probe:
+            circuit_breaker.release_probe()
+        return None
+    try:
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            response = model.generate_content(
-                prompt,
-                generation_config={
-                    'temperature': 0.7,
-                    'top_p': 0.95,
-                    'top_k': 40,
-                    'max_output_tokens': 4096,
-                }
-            )
-            
-            if response and response.text:
-                logger.info(f"Successfully received AI response on attempt {attempt + 1}")
-                return response.text
-                
+            generation_config = build_generation_config(max_output_tokens)
         except Exception as e:
-            logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-            if attempt == max_retries - 1:
-                logger.error("All retry attempts failed")
-                return None
-    
-    return None
+            logger.error(f"Gemini SDK unavailable: {str(e)}")
+            return None
+        deadline = time.monotonic() + GEMINI_REQUEST_DEADLINE
+        for attempt in range(max_retries):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Gemini request deadline exceeded")
+                break
+            started = time.perf_counter()
+            try:
+                model = gemini_pool.get_model()
+                with gemini_pool.timeout(min(GEMINI_ATTEMPT_TIMEOUT, remaining)):
+                    response = model.generate_content(prompt, generation_config=generation_config)
+                
+                if response and response.text:
+                    logger.info(f"Successfully received AI response on attempt {attempt + 1}")
+                    metrics.observe('crop_gemini_attempt_seconds', time.perf_counter() - started, outcome='success')
+                    token_usage.record(prompt, response.text, time.perf_counter() - started, response)
+                    circuit_breaker.record_success()
+                    return response.text
+                    
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                metrics.observe('crop_gemini_attempt_seconds', time.perf_counter() - started, outcome=type(e).__name__)
+                if not is_retryable_error(e):
+                    return None
+                circuit_breaker.record_failure()
+                if attempt == max_retries - 1 or circuit_breaker.state == 'open':
+                    break
+                delay = get_backoff_delay(e, attempt)
+                if delay >= deadline - time.monotonic():
+                    break
+                metrics.inc('crop_gemini_retries_total')
+                time.sleep(delay)
+        
+        logger.error("All retry attempts failed")
+        return None
+    finally:
+        if probe:
+            circuit_breaker.release_probe()
+        upstream_limiter.release()
 
-def parse_ai_response(response_text: str) -> Dict:
+def stream_ai_recommendation(prompt: str, max_output_tokens: Optional[int] = None):
+    allowed, probe = circuit_breaker.allow_request()
+    if not allowed:
+        logger.warning("Gemini circuit breaker open, skipping AI call")
+        return
+    if not upstream_limiter.acquire():
+        if probe:
+            circuit_breaker.release_probe()
+        return
     try:
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
+        model = gemini_pool.get_model()
+        generation_config = build_generation_config(max_output_tokens)
+        started = time.perf_counter()
+        parts = []
+        with gemini_pool.timeout(GEMINI_REQUEST_DEADLINE):
+            response = model.generate_content(prompt, generation_config=generation_config, stream=True)
+        for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
+        logger.info("Finished streaming AI response")
+        token_usage.record(prompt, ''.join(parts), time.perf_counter() - started)
+        circuit_breaker.record_success()
+    except Exception as e:
+        if is_retryable_error(e):
+            circuit_breaker.record_failure()
+        raise
+    finally:
+        if probe:
+            circuit_breaker.release_probe()
+        upstream_limiter.release()
+
+class CropStreamParser:
+    # Incrementally scans streamed JSON text and returns each entry of
+    # "recommended_crops" as soon as its closing brace arrives.
+    def __init__(self):
+        self.buffer = ''
+        self.pos = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.object_start = None
+        self.finished = False
+
+    def feed(self, text: str) -> List[Dict]:
+        self.buffer += text
+        crops = []
+        if self.pos is None:
+            key_idx = self.buffer.find('"recommended_crops"')
+            bracket_idx = self.buffer.find('[', key_idx) if key_idx != -1 else -1
+            if bracket_idx == -1:
+                return crops
+            self.pos = bracket_idx + 1
         
-        if start_idx != -1 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            parsed = json.loads(json_str)
-            return parsed
+        while self.pos < len(self.buffer) and not self.finished:
+            char = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 0 and char == '{':
+                    self.object_start = self.pos
+                self.depth += 1
+            elif char in '}]':
+                if self.depth == 0:
+                    self.finished = True
+                else:
+                    self.depth -= 1
+                    if self.depth == 0 and self.object_start is not None:
+                        try:
+                            crops.append(json.loads(self.buffer[self.object_start:self.pos + 1]))
+                        except json.JSONDecodeError as e:
+                            logger.warning(f"Failed to parse streamed crop: {str(e)}")
+                        self.object_start = None
+            self.pos += 1
+        return crops
+
+def build_cache_key(data: Dict, language: str) -> str:
+    canonical = {field: ' '.join(str(data.get(field, '')).split()).casefold() for field in CACHE_KEY_FIELDS}
+    canonical['language'] = (language or 'english').casefold()
+    canonical['data_version'] = get_agronomy().version
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode('utf-8')).hexdigest()
+
+def get_cached_recommendation(data: Dict, language: str, prompt: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    key = build_cache_key(data, language)
+    precomputed = precomputed_store.get(key)
+    if precomputed is not None:
+        logger.info("Serving precomputed AI recommendation")
+        return precomputed
+    
+    cached = recommendation_cache.get(key)
+    if cached is not None:
+        logger.info("Serving AI recommendation from cache")
+        return cached
+    
+    def fetch():
+        if rate_limiter:
+            rate_limiter.wait()
+        ai_response = get_ai_recommendation(prompt, max_output_tokens=get_output_token_budget(data, language))
+        if ai_response is not None and is_cacheable_response(ai_response):
+            recommendation_cache.set(key, ai_response)
+        return ai_response
+    
+    prompt_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return single_flight.do(prompt_key, fetch, lambda: recommendation_cache.peek(key))
+
+def get_recommendation_text(data: Dict, state_info: Dict, rule_suggestions: Dict, language: str, prompt: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    if TRANSLATION_PIPELINE and language != 'english' and language in get_agronomy().languages:
+        localized = get_localized_recommendation(data, state_info, rule_suggestions, language, rate_limiter)
+        if localized is not None:
+            return localized
+        logger.warning(f"Translation pipeline failed for {language}, generating directly")
+    return get_cached_recommendation(data, language, prompt, rate_limiter)
+
+def get_localized_recommendation(data: Dict, state_info: Dict, rule_suggestions: Dict, language: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[str]:
+    key = build_cache_key(data, language)
+    cached = precomputed_store.get(key) or recommendation_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    english_prompt = build_enhanced_prompt(data, state_info, rule_suggestions, 'english')
+    english_response = get_cached_recommendation(data, 'english', english_prompt, rate_limiter)
+    if english_response is None:
+        return None
+    english_result = parse_ai_response(english_response)
+    if 'raw_response' in english_result:
+        return None
+    
+    localized = localize_recommendation(english_result, language, rate_limiter)
+    if localized is None:
+        return None
+    localized_response = json.dumps(localized, ensure_ascii=False)
+    recommendation_cache.set(key, localized_response)
+    return localized_response
+
+def collect_phrases(value, phrases: Dict) -> Dict:
+    if isinstance(value, dict):
+        for item in value.values():
+            collect_phrases(item, phrases)
+    elif isinstance(value, list):
+        for item in value:
+            collect_phrases(item, phrases)
+    elif isinstance(value, str) and any(char.isalpha() for char in value):
+        phrases[value] = None
+    return phrases
+
+def replace_phrases(value, translations: Dict):
+    if isinstance(value, dict):
+        return {key: replace_phrases(item, translations) for key, item in value.items()}
+    if isinstance(value, list):
+        return [replace_phrases(item, translations) for item in value]
+    if isinstance(value, str):
+        return translations.get(value, value)
+    return value
+
+def localize_recommendation(result: Dict, language: str, rate_limiter: Optional[RateLimiter] = None) -> Optional[Dict]:
+    # Only value strings are translated; phrases already translated for this
+    # language come from the phrase memo.
+    translations = {}
+    missing = []
+    for phrase in collect_phrases(result, {}):
+        memo_key = f'phrase:{language}:' + hashlib.sha256(phrase.encode('utf-8')).hexdigest()
+        translated = phrase_memo.get(memo_key)
+        if translated is None:
+            missing.append(phrase)
         else:
-            return {'raw_response': response_text}
-            
+            translations[phrase] = translated
+    
+    lang_name = get_agronomy().languages[language]['name']
+    for start in range(0, len(missing), TRANSLATION_BATCH_SIZE):
+        phrases = missing[start:start + TRANSLATION_BATCH_SIZE]
+        if rate_limiter:
+            rate_limiter.wait()
+        translated = translate_phrases(phrases, lang_name)
+        if translated is None:
+            return None
+        for phrase, text in zip(phrases, translated):
+            translations[phrase] = text
+            phrase_memo.set(f'phrase:{language}:' + hashlib.sha256(phrase.encode('utf-8')).hexdigest(), text)
+    
+    logger.info(f"Localized recommendation to {lang_name}: {len(missing)} new phrase(s), {len(translations) - len(missing)} from memo")
+    return replace_phrases(result, translations)
+
+def translate_phrases(phrases: List[str], lang_name: str) -> Optional[List[str]]:
+    prompt = f"""Translate each English string in the JSON array below into {lang_name}. Keep numbers, units, currency symbols and crop varieties accurate.
+
+{json.dumps(phrases, ensure_ascii=False)}
+
+Respond ONLY with a JSON array of {len(phrases)} translated strings in the same order, no additional text."""
+    
+    response_text = get_ai_recommendation(prompt)
+    if response_text is None:
+        return None
+    try:
+        translated = json.loads(response_text[response_text.find('['):response_text.rfind(']') + 1])
     except json.JSONDecodeError as e:
-        logger.warning(f"Failed to parse JSON: {str(e)}")
+        logger.warning(f"Failed to parse translation: {str(e)}")
+        return None
+    if not isinstance(translated, list) or len(translated) != len(phrases) or not all(isinstance(text, str) for text in translated):
+        logger.warning("Translation returned a mismatched array")
+        return None
+    return translated
+
+def parse_ai_response(response_text: str) -> Dict:
+    parsed, outcome = decode_ai_json(response_text)
+    metrics.inc('crop_parse_results_total', outcome=outcome)
+    if parsed is None:
+        logger.warning("Failed to parse JSON from AI response")
         return {'raw_response': response_text}
+    if outcome == 'repaired':
+        logger.info("Repaired malformed JSON in AI response")
+    return validate_recommendation(parsed)
+
+def is_cacheable_response(response_text: str) -> bool:
+    # Unparseable answers are served once but never stored, so a retry can
+    # replace them instead of being pinned for the cache lifetime
+    if decode_ai_json(response_text)[1] != 'failed':
+        return True
+    logger.warning("Not caching an AI response that could not be parsed")
+    return False
+
+def decode_ai_json(response_text: str) -> tuple:
+    text = response_text.strip()
+    try:
+        parsed = orjson.loads(text) if orjson else json.loads(text)
+        if isinstance(parsed, dict):
+            return parsed, 'clean'
+        wrapped = wrap_crop_list(parsed)
+        if wrapped is not None:
+            return wrapped, 'repaired'
+    except ValueError:
+        pass
+    
+    start_idx = text.find('{')
+    if start_idx == -1:
+        return None, 'failed'
+    # A bare list of crops (possibly fenced or truncated) is decoded as the
+    # recommended_crops of an object rather than as its first crop
+    list_idx = text.rfind('[', 0, start_idx)
+    if list_idx != -1 and not text[list_idx + 1:start_idx].strip():
+        try:
+            wrapped = wrap_crop_list(json.JSONDecoder().raw_decode(text, list_idx)[0])
+            if wrapped is not None:
+                return wrapped, 'repaired'
+        except json.JSONDecodeError:
+            pass
+        text, start_idx = '{"recommended_crops":' + text[list_idx:], 0
+    # raw_decode stops after the first complete object, ignoring code fences,
+    # trailing prose or a second JSON block
+    try:
+        return json.JSONDecoder().raw_decode(text, start_idx)[0], 'clean'
+    except json.JSONDecodeError:
+        pass
+    
+    try:
+        return json.loads(repair_json(text, start_idx)), 'repaired'
+    except json.JSONDecodeError:
+        pass
+    
+    crops = CropStreamParser().feed(text)
+    if crops:
+        return {'recommended_crops': crops}, 'repaired'
+    return None, 'failed'
+
+def wrap_crop_list(value) -> Optional[Dict]:
+    # A top-level list is either the crops themselves or the whole answer
+    # wrapped in a list; anything else is not a recommendation
+    if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+        return None
+    if len(value) == 1 and 'recommended_crops' in value[0]:
+        return value[0]
+    return {'recommended_crops': value}
+
+def repair_json(text: str, start_idx: int) -> str:
+    # Single pass over the first JSON object: drops trailing commas, escapes
+    # raw newlines in strings and closes anything left open by a truncated
+    # response.
+    out = []
+    closers = []
+    in_string = False
+    escape = False
+    for char in text[start_idx:]:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            if char == '\n':
+                # Escape as two list items so list indexes match text offsets
+                out.extend('\\n')
+                continue
+            out.append(char)
+            continue
+        
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            closers.append('}' if char == '{' else ']')
+        elif char in '}]':
+            strip_dangling(out)
+            if not closers:
+                continue
+            out.append(closers.pop())
+            if not closers:
+                break
+            continue
+        out.append(char)
+    
+    if in_string:
+        out.append('"')
+    strip_dangling(out)
+    out.extend(reversed(closers))
+    return ''.join(out)
+
+def strip_dangling(out: List[str]) -> None:
+    # Removes whitespace, a trailing comma, or a key left without a value
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ',':
+        out.pop()
+    elif out and out[-1] == ':':
+        tail = ''.join(out).rstrip(':').rstrip()
+        key_start = tail.rfind('"', 0, len(tail) - 1)
+        del out[key_start:]
+        strip_dangling(out)
+
+def validate_recommendation(parsed: Dict) -> Dict:
+    crops = parsed.get('recommended_crops')
+    if crops is None:
+        return parsed
+    if not isinstance(crops, list):
+        crops = [crops] if isinstance(crops, dict) else []
+    
+    valid_crops = []
+    for crop in crops:
+        if not isinstance(crop, dict) or not crop.get('name'):
+            continue
+        if all(is_valid_crop_field(field, value) for field, value in crop.items()):
+            valid_crops.append(crop)
+            continue
+        valid_crop = {}
+        for field, value in crop.items():
+            subfields = CROP_FIELDS.get(field)
+            if subfields is None:
+                valid_crop[field] = coerce_text(value)
+            elif isinstance(value, dict):
+                valid_crop[field] = {key: coerce_text(item) for key, item in value.items()}
+            else:
+                valid_crop[field] = coerce_text(value)
+        valid_crops.append(valid_crop)
+    
+    return {**parsed, 'recommended_crops': valid_crops}
+
+def is_valid_crop_field(field: str, value) -> bool:
+    if CROP_FIELDS.get(field) is None:
+        return isinstance(value, str)
+    return isinstance(value, dict) and all(isinstance(item, str) for item in value.values())
+
+def coerce_text(value):
+    if isinstance(value, (str, dict)) or value is None:
+        return value
+    if isinstance(value, list):
+        return '; '.join(str(item) for item in value)
+    return str(value)
 
 def sanitize_inputs(data: Dict) -> Dict:
     return {k: v for k, v in data.items() if v and str(v).strip()}
 
 @app.route('/health', methods=['GET'])
 def health_check():
+    snapshot = get_agronomy()
     return jsonify({
         'status': 'healthy',
         'service': 'All India Crop Recommendation API',
-        'states_covered': len(INDIAN_STATES_DISTRICTS),
+        'states_covered': len(snapshot.states),
         'gemini_configured': bool(GEMINI_KEY),
-        'languages_supported': len(LANGUAGES)
+        'languages_supported': len(snapshot.languages),
+        **get_component_stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    gauges = {}
+    for component, stats in get_component_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)):
+                gauges[f'crop_{component}_{key}'] = float(value)
+            elif key == 'state':
+                gauges[f'crop_{component}_open'] = float(value == 'open')
+    return app.response_class(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+def get_component_stats() -> Dict:
+    return {
+        'cache': recommendation_cache.stats(),
+        'upstream': upstream_limiter.stats(),
+        'rate_limit': client_rate_limiter.stats(),
+        'jobs': job_queue.stats(),
+        'circuit_breaker': circuit_breaker.stats(),
+        'single_flight': single_flight.stats(),
+        'precomputed': precomputed_store.stats(),
+        'phrase_memo': phrase_memo.stats(),
+        'tokens': token_usage.stats(),
+        'agronomy': agronomy_store.stats()
+    }
+
+@app.before_request
+def check_agronomy_reload():
+    reload_agronomy_tables()
+    g.agronomy = agronomy
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    metrics.add('crop_http_requests_in_flight', 1)
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    elapsed = time.perf_counter() - g.get('request_started', time.perf_counter())
+    metrics.inc('crop_http_requests_total', endpoint=endpoint, status=response.status_code)
+    metrics.observe('crop_http_request_seconds', elapsed, endpoint=endpoint)
+    if response.content_length is not None and not response.is_streamed:
+        metrics.observe('crop_response_bytes', response.content_length, endpoint=endpoint, **get_metric_labels())
+    
+    timings = g.get('stage_timings')
+    if timings and should_profile():
+        response.headers['Server-Timing'] = ', '.join(f'{name};dur={seconds * 1000:.2f}' for name, seconds in timings)
+        logger.info(f"Stage breakdown for {endpoint}: " + ', '.join(f'{name}={seconds * 1000:.2f}ms' for name, seconds in timings))
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    metrics.add('crop_http_requests_in_flight', -1)
+
+@app.before_request
+def enforce_client_rate_limit():
+    if request.endpoint not in RATE_LIMITED_ENDPOINTS:
+        return None
+    key, rate, burst = get_client_identity()
+    if rate <= 0:
+        return None
+    burst = max(1, burst)
+    cost = get_rate_limit_cost(key)
+    if cost > burst:
+        metrics.inc('crop_rate_limited_total', endpoint=request.endpoint)
+        return jsonify({'error': f'Batches with AI recommendations for more than {burst} rows require an API key.'}), 403
+    retry_after = client_rate_limiter.consume(key, rate, burst, cost)
+    if not retry_after:
+        return None
+    
+    metrics.inc('crop_rate_limited_total', endpoint=request.endpoint)
+    response = jsonify({'error': 'Too many requests. Please try again later.', 'retry_after': math.ceil(retry_after)})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+def get_rate_limit_cost(key: str) -> int:
+    # A batch can make one Gemini call per row, so clients without an API key
+    # pay a token per AI row; API-key batches are paced by BATCH_RATE_LIMIT.
+    if request.endpoint != 'recommend_batch' or key.startswith('key:'):
+        return 1
+    body = request.get_json(silent=True) or {}
+    rows = body.get('rows') if isinstance(body, dict) else None
+    if not isinstance(rows, list) or not parse_flag(body.get('ai', True)):
+        return 1
+    return max(1, len(rows))
+
+def should_profile() -> bool:
+    if PROFILING_ENABLED and request.headers.get('X-Profile-Stages') == '1':
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
 @app.errorhandler(404)
 def not_found(e):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -581,10 +3003,21 @@ def internal_error(e):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        run_batch_cli(sys.argv[2:])
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'warm':
+        run_warm_cli(sys.argv[2:])
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'compile-data':
+        run_compile_data_cli(sys.argv[2:])
+        sys.exit(0)
+    
     port = int(os.getenv('PORT', 5000))
     debug_mode = os.getenv('FLASK_ENV') == 'development'
     
     logger.info(f"Starting All India Crop Recommendation System")
-    logger.info(f"Covering {len(INDIAN_STATES_DISTRICTS)} states/UTs")
-    logger.info(f"Supporting {len(LANGUAGES)} languages")
+    logger.info(f"Covering {len(agronomy.states)} states/UTs")
+    logger.info(f"Supporting {len(agronomy.languages)} languages")
+    job_queue.start()
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
\ No newline at end of file
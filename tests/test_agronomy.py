@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    source = tmp_path / 'agronomy.json'
+    shutil.copy(main.AGRONOMY_DATA_PATH, source)
+    store = main.AgronomyStore(str(source), str(tmp_path / 'agronomy.db'), 0.001, main.AGRONOMY_MMAP_SIZE)
+    monkeypatch.setattr(main, 'agronomy_store', store)
+    monkeypatch.setattr(main, 'agronomy', store.load())
+    monkeypatch.setattr(main, 'RATE_LIMIT_PER_MINUTE', 0)
+    return store
+
+def edit_source(store, edit):
+    with open(store.source_path, encoding='utf-8') as f:
+        source = json.load(f)
+    edit(source)
+    with open(store.source_path, 'w', encoding='utf-8') as f:
+        json.dump(source, f)
+    os.utime(store.source_path, (store._mtimes[0] + 10, store._mtimes[0] + 10))
+    store._next_check = 0
+
+def test_reload_swaps_snapshot(store):
+    previous = main.agronomy
+    edit_source(store, lambda source: source['states']['Kerala']['districts'].append('Testpuram'))
+    response = main.app.test_client().get('/health')
+    assert response.status_code == 200
+    assert main.agronomy is not previous
+    assert main.agronomy.version == store.version == response.get_json()['agronomy']['version']
+    assert main.resolve_district('Kerala', 'Testpuram') == 'Testpuram'
+
+def test_bad_reload_keeps_previous_version(store):
+    previous = main.agronomy
+    edit_source(store, lambda source: source['states']['Kerala'].pop('major_crops'))
+    response = main.app.test_client().get('/health')
+    assert response.status_code == 200
+    assert main.agronomy is previous
+    stats = response.get_json()['agronomy']
+    assert stats['version'] == previous.version
+    assert stats['errors'] == 1
+    assert stats['reloads'] == 0
+
+def test_request_keeps_its_snapshot_across_a_reload(store):
+    with main.app.test_request_context('/'):
+        main.check_agronomy_reload()
+        pinned = main.get_agronomy()
+        edit_source(store, lambda source: source['states'].pop('Kerala'))
+        assert main.reload_agronomy_tables()
+        assert main.get_agronomy() is pinned
+        assert main.resolve_state('Kerala') == 'Kerala'
+    assert 'Kerala' not in main.get_agronomy().states
+
+@pytest.mark.parametrize('edit', [
+    lambda source: source['states']['Kerala'].update(districts='Kollam'),
+    lambda source: source['soils']['red'].pop('primary'),
+    lambda source: source['seasons'].update(kharif='rice'),
+    lambda source: source.pop('languages'),
+])
+def test_parse_rejects_invalid_entries(edit):
+    with open(main.AGRONOMY_DATA_PATH, encoding='utf-8') as f:
+        source = json.load(f)
+    edit(source)
+    with pytest.raises(ValueError):
+        main.parse_agronomy_source(json.dumps(source).encode('utf-8'))
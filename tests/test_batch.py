@@ -0,0 +1,61 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import threading
+import time
+
+import main
+
+def make_rows(count: int):
+    districts = main.agronomy.states['Kerala']['districts']
+    seasons = list(main.agronomy.seasons)
+    return [{'state': 'Kerala', 'district': districts[i % len(districts)], 'soil_type': 'laterite', 'season': seasons[i // len(districts) % len(seasons)]} for i in range(count)]
+
+def test_identical_rows_share_one_ai_call(monkeypatch):
+    calls = []
+    
+    def get_recommendation_text(data, *args):
+        calls.append(data)
+        return '{"recommended_crops": [{"name": "Rice"}]}'
+    
+    monkeypatch.setattr(main, 'get_recommendation_text', get_recommendation_text)
+    rows = make_rows(1) * 3
+    results = list(main.run_batch(rows, True, 2))
+    assert [result['row'] for result in results] == [0, 1, 2]
+    assert all(result['ai_recommendation']['recommended_crops'][0]['name'] == 'Rice' for result in results)
+    assert len(calls) == 1
+
+def test_closing_the_run_cancels_queued_rows(monkeypatch):
+    calls = []
+    release = threading.Event()
+    
+    def get_recommendation_text(data, *args):
+        # The first row answers at once; later rows hang until the test ends
+        calls.append(data)
+        if len(calls) > 1:
+            release.wait(5)
+        return '{"recommended_crops": []}'
+    
+    monkeypatch.setattr(main, 'get_recommendation_text', get_recommendation_text)
+    results = main.run_batch(make_rows(30), True, 1)
+    assert next(results)['row'] == 0
+    results.close()
+    release.set()
+    time.sleep(0.1)
+    assert len(calls) <= 2
+
+def test_invalid_rows_are_reported_in_place(monkeypatch):
+    monkeypatch.setattr(main, 'get_recommendation_text', lambda *args: None)
+    rows = make_rows(2)
+    rows[0] = dict(rows[0], state='Atlantis')
+    results = list(main.run_batch(rows, True, 1, start=0))
+    assert 'Invalid state' in results[0]['error']
+    assert results[1]['success'] and 'ai_recommendation' not in results[1]
+
+def test_batch_endpoint_rejects_bad_options():
+    client = main.app.test_client()
+    rows = make_rows(1)
+    assert client.post('/recommend/batch', json={'rows': rows, 'ai': 'maybe'}).status_code == 400
+    assert client.post('/recommend/batch', json={'rows': rows, 'start': 'x'}).status_code == 400
+    assert client.post('/recommend/batch', json={'rows': 'nope'}).status_code == 400
@@ -0,0 +1,58 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import main
+
+def test_peek_does_not_count(tmp_path):
+    cache = main.RecommendationCache(60, 10, 1 << 20, str(tmp_path / 'cache.db'))
+    assert cache.peek('key') is None
+    cache.set('key', 'value')
+    assert cache.peek('key') == 'value'
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+    assert cache.get('key') == 'value'
+    assert cache.get('other') is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+def test_follower_polling_does_not_count_misses(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'cache.db')
+    cache = main.RecommendationCache(60, 10, 1 << 20, db_path)
+    flight = main.SingleFlight(5, 0.01, db_path)
+    monkeypatch.setattr(main, 'recommendation_cache', cache)
+    monkeypatch.setattr(main, 'single_flight', flight)
+    monkeypatch.setattr(main, 'precomputed_store', main.PrecomputedStore(None, 1))
+    
+    # Another worker holds the lease and publishes its result after a few polls
+    other = main.SingleFlight(5, 0.01, db_path)
+    prompt = 'prompt'
+    key = main.build_cache_key({'state': 'Kerala'}, 'english')
+    assert other._acquire_lease(main.hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+    polls = []
+    original_peek = cache.peek
+    def peek(lookup_key):
+        polls.append(lookup_key)
+        if len(polls) == 5:
+            cache.set(key, '{"recommended_crops": []}')
+        return original_peek(lookup_key)
+    monkeypatch.setattr(cache, 'peek', peek)
+    
+    assert main.get_cached_recommendation({'state': 'Kerala'}, 'english', prompt) == '{"recommended_crops": []}'
+    assert len(polls) >= 5
+    assert cache.stats()['misses'] == 1
+
+def test_expired_rows_are_purged_periodically(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'cache.db')
+    cache = main.RecommendationCache(60, 10, 1 << 20, db_path)
+    cache.set('old', 'value')
+    with cache._connect() as conn:
+        conn.execute("UPDATE recommendations SET expires_at = 0 WHERE key = 'old'")
+        plan = ' '.join(str(row) for row in conn.execute('EXPLAIN QUERY PLAN DELETE FROM recommendations WHERE expires_at <= 1'))
+    assert 'recommendations_expires_at' in plan
+    
+    cache.set('new', 'value')
+    with cache._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM recommendations WHERE key = 'old'").fetchone()[0] == 1
+    for number in range(999):
+        cache.set(f'key{number}', 'value')
+    with cache._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM recommendations WHERE key = 'old'").fetchone()[0] == 0
@@ -0,0 +1,74 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import main
+
+def open_breaker() -> main.CircuitBreaker:
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+def test_half_open_admits_one_probe():
+    breaker = open_breaker()
+    assert breaker.allow_request() == (True, True)
+    assert breaker.allow_request() == (False, False)
+    breaker.release_probe()
+    assert breaker.allow_request() == (True, True)
+
+def test_call_admitted_while_closed_does_not_release_probe(monkeypatch):
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    monkeypatch.setattr(main, 'circuit_breaker', breaker)
+    started = []
+    
+    def generate(prompt, generation_config):
+        # A long call admitted while closed; another call fails meanwhile and
+        # the breaker goes half-open with a probe in flight.
+        if not started:
+            started.append(True)
+            breaker.record_failure()
+            assert breaker.allow_request() == (True, True)
+        raise ValueError('bad request')
+    
+    class Model:
+        generate_content = staticmethod(generate)
+    
+    monkeypatch.setattr(main.gemini_pool, 'get_model', lambda: Model())
+    monkeypatch.setattr(main, 'build_generation_config', lambda max_output_tokens=None: {})
+    assert main.get_ai_recommendation('hello') is None
+    assert breaker.allow_request() == (False, False)
+
+def test_success_closes_breaker():
+    breaker = open_breaker()
+    breaker.allow_request()
+    breaker.record_success()
+    breaker.release_probe()
+    assert breaker.stats()['state'] == 'closed'
+    assert breaker.allow_request() == (True, False)
+
+def test_client_calls_disable_builtin_retry():
+    pool = main.GeminiClientPool('model', 1, 'rest')
+    seen = []
+    call = pool._with_timeout(lambda request, **kwargs: seen.append(kwargs))
+    with pool.timeout(2.5):
+        call('request')
+    call('request', timeout=9, retry='custom')
+    assert seen == [{'timeout': 2.5, 'retry': None}, {'timeout': 9, 'retry': 'custom'}]
+
+def test_503s_are_retried_only_by_our_loop(monkeypatch):
+    from google.api_core import exceptions as google_exceptions
+    breaker = main.CircuitBreaker(failure_threshold=10, reset_timeout=60)
+    monkeypatch.setattr(main, 'circuit_breaker', breaker)
+    monkeypatch.setattr(main, 'get_backoff_delay', lambda error, attempt: 0)
+    monkeypatch.setattr(main, 'build_generation_config', lambda max_output_tokens=None: {})
+    attempts = []
+    
+    class Model:
+        def generate_content(self, prompt, generation_config):
+            attempts.append(prompt)
+            raise google_exceptions.ServiceUnavailable('overloaded')
+    
+    monkeypatch.setattr(main.gemini_pool, 'get_model', lambda: Model())
+    assert main.get_ai_recommendation('hello', max_retries=3) is None
+    assert len(attempts) == 3
+    assert breaker.stats()['consecutive_failures'] == 3
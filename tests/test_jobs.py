@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+FORM = {'state': 'Kerala', 'district': 'Kollam', 'soil_type': 'laterite', 'season': 'kharif', 'irrigation': 'yes'}
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    # No worker threads: jobs stay queued unless a test runs the handler itself
+    queue = main.JobQueue(str(tmp_path / 'jobs.db'), main.run_recommendation_job, 0, 100, 3, 60, 3600, 0.05)
+    monkeypatch.setattr(main, 'job_queue', queue)
+    monkeypatch.setattr(main, 'RATE_LIMIT_PER_MINUTE', 0)
+    return queue
+
+def test_submit_without_workers_creates_schema(queue):
+    job = queue.submit('a' * 64, {'state': 'Kerala'}, 'english', 5)
+    assert job['status'] == 'queued'
+    assert job['position'] == 0
+
+def test_identical_submissions_share_one_job(queue):
+    first = queue.submit('b' * 64, {'state': 'Kerala'}, 'english', 2)
+    second = queue.submit('b' * 64, {'state': 'Kerala'}, 'english', 7)
+    assert first['id'] == second['id']
+    assert second['priority'] == 7
+    assert queue.stats()['submitted'] == 1
+    assert queue.stats()['deduplicated'] == 1
+
+def test_full_queue_rejects_new_jobs(queue):
+    queue.max_queued = 1
+    assert queue.submit('c' * 64, {}, 'english', 5) is not None
+    assert queue.submit('d' * 64, {}, 'english', 5) is None
+
+def test_job_does_not_leak_first_submitters_inputs(queue):
+    client = main.app.test_client()
+    first = client.post('/recommend/jobs', data=dict(FORM, name='Lakshmi Devi'))
+    second = client.post('/recommend/jobs', data=dict(FORM, name='Ravi'))
+    assert first.get_json()['id'] == second.get_json()['id']
+    assert first.get_json()['inputs']['name'] == 'Lakshmi Devi'
+    assert second.get_json()['inputs']['name'] == 'Ravi'
+    
+    polled = client.get(first.headers['Location']).get_json()
+    assert 'inputs' not in polled
+    assert 'name' not in queue.get(polled['id'])['data']
+    assert 'Lakshmi' not in str(polled)
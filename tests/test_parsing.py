@@ -0,0 +1,88 @@
+import json
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'sample_response.json')
+
+@pytest.fixture(scope='module')
+def sample():
+    with open(SAMPLE_PATH, encoding='utf-8') as f:
+        return f.read()
+
+def test_clean_json(sample):
+    parsed, outcome = main.decode_ai_json(sample)
+    assert outcome == 'clean'
+    assert parsed == json.loads(sample)
+
+@pytest.mark.parametrize('wrap', [
+    lambda text: f'```json\n{text}\n```',
+    lambda text: f'Here is the recommendation:\n{text}\nGood luck!',
+    lambda text: f'{text}\n{{"second": "block"}}',
+])
+def test_object_inside_prose_or_fences(sample, wrap):
+    parsed, outcome = main.decode_ai_json(wrap(sample))
+    assert outcome == 'clean'
+    assert parsed == json.loads(sample)
+
+def test_repairs_trailing_commas_and_raw_newlines():
+    text = '{"recommended_crops": [{"name": "Rice", "climate_suitability": "warm\nand humid",},],}'
+    parsed, outcome = main.decode_ai_json(text)
+    assert outcome == 'repaired'
+    assert parsed == {'recommended_crops': [{'name': 'Rice', 'climate_suitability': 'warm\nand humid'}]}
+
+def test_repairs_truncated_response(sample):
+    parsed, outcome = main.decode_ai_json(sample[:len(sample) // 2])
+    assert outcome == 'repaired'
+    crops = parsed['recommended_crops']
+    assert crops[0] == json.loads(sample)['recommended_crops'][0]
+
+def test_repair_json_closes_open_structures():
+    repaired = main.repair_json('prefix {"a": ["x", {"b": "unterminated', 7)
+    assert json.loads(repaired) == {'a': ['x', {'b': 'unterminated'}]}
+
+@pytest.mark.parametrize('text', [
+    '[{"name": "Rice"}, {"name": "Wheat"}]',
+    '```json\n[{"name": "Rice"}, {"name": "Wheat"}]\n```',
+    '[{"recommended_crops": [{"name": "Rice"}, {"name": "Wheat"}]}]',
+])
+def test_top_level_crop_list_is_wrapped(text):
+    parsed, outcome = main.decode_ai_json(text)
+    assert outcome == 'repaired'
+    assert [crop['name'] for crop in parsed['recommended_crops']] == ['Rice', 'Wheat']
+
+def test_truncated_crop_list_keeps_complete_crops():
+    parsed, outcome = main.decode_ai_json('[{"name": "Rice"}, {"name": "Wheat", "benefits": {"yield_potential": "4 t')
+    assert outcome == 'repaired'
+    assert parsed['recommended_crops'][0] == {'name': 'Rice'}
+    assert parsed['recommended_crops'][1]['name'] == 'Wheat'
+
+@pytest.mark.parametrize('text', ['', 'Sorry, I cannot help with that.', '[1, 2, 3]'])
+def test_unparseable_responses_fail(text):
+    assert main.decode_ai_json(text) == (None, 'failed')
+    assert not main.is_cacheable_response(text)
+
+def test_parse_ai_response_keeps_raw_text_on_failure():
+    assert main.parse_ai_response('not json') == {'raw_response': 'not json'}
+
+def test_validate_recommendation_coerces_fields():
+    parsed = main.validate_recommendation({'recommended_crops': [
+        {'name': 'Rice', 'water_requirement': ['1200mm', 'flooded'], 'growth_cycle': {'duration': 120}, 'benefits': 'high yield'},
+        {'climate_suitability': 'no name'},
+        'not a crop',
+    ]})
+    assert parsed['recommended_crops'] == [
+        {'name': 'Rice', 'water_requirement': '1200mm; flooded', 'growth_cycle': {'duration': '120'}, 'benefits': 'high yield'}
+    ]
+
+def test_validate_recommendation_keeps_valid_crops_as_is(sample):
+    recommendation = json.loads(sample)
+    validated = main.validate_recommendation(recommendation)
+    assert all(a is b for a, b in zip(validated['recommended_crops'], recommendation['recommended_crops']))
+
+def test_validate_recommendation_wraps_single_crop():
+    assert main.validate_recommendation({'recommended_crops': {'name': 'Rice'}}) == {'recommended_crops': [{'name': 'Rice'}]}
@@ -0,0 +1,68 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+@pytest.mark.parametrize('text, expected', [
+    ('Tamil Nadu', 'Tamil Nadu'),
+    ('  tamil   NADU ', 'Tamil Nadu'),
+    ('Tamil Nadoo', 'Tamil Nadu'),
+    ('Karnatak', 'Karnataka'),
+    ('Orissa', 'Odisha'),
+    ('J&K', 'Jammu and Kashmir'),
+    ('Atlantis', None),
+    ('', None),
+])
+def test_resolve_state(text, expected):
+    assert main.resolve_state(text) == expected
+
+@pytest.mark.parametrize('state, text, expected', [
+    ('Kerala', 'Kollam', 'Kollam'),
+    ('Kerala', 'kollam district', 'Kollam'),
+    ('Kerala', 'Kolam', 'Kollam'),
+    ('Tamil Nadu', 'Tiruchirapalli', 'Tiruchirappalli'),
+    ('Karnataka', 'Bangalore', 'Bengaluru Urban'),
+    ('Andhra Pradesh', 'Vizag', 'Visakhapatnam'),
+    ('Kerala', 'Chennai', None),
+    ('Kerala', '', None),
+])
+def test_resolve_district(state, text, expected):
+    assert main.resolve_district(state, text) == expected
+
+def test_normalize_place():
+    assert main.normalize_place('Thiruvallur District') == 'thiruvallur'
+    assert main.normalize_place('Gaurela-Pendra-Marwahi') == 'gaurela pendra marwahi'
+    assert main.normalize_place('Dakṣiṇa') == 'daksina'
+    assert main.normalize_place('Jammu & Kashmir') == 'jammu and kashmir'
+
+def test_suggest_districts_stays_in_state():
+    suggestions = main.suggest_districts('Kerala', 'Kotayam')
+    assert suggestions[0] == 'Kottayam'
+    assert all(district in main.agronomy.states['Kerala']['districts'] for district in suggestions)
+
+def test_autocomplete_prefers_prefixes_and_reports_aliases():
+    results = main.autocomplete_places('viz', 'Andhra Pradesh')
+    assert results[0] == {'state': 'Andhra Pradesh', 'district': 'Visakhapatnam', 'alias': 'Vizag'}
+    assert all(result['state'] == 'Andhra Pradesh' for result in results)
+    assert len(main.autocomplete_places('a', limit=5)) == 5
+    assert main.autocomplete_places('  ') == []
+
+def test_recommendation_input_is_canonicalized():
+    data = {'state': 'tamilnadu', 'district': 'Tiruchirapalli', 'soil_type': 'red'}
+    assert main.check_recommendation_input(data) is None
+    assert (data['state'], data['district']) == ('Tamil Nadu', 'Tiruchirappalli')
+
+def test_district_outside_state_gets_suggestions():
+    error = main.check_recommendation_input({'state': 'Kerala', 'district': 'Kolllam', 'soil_type': 'red'})
+    assert error is None
+    error = main.check_recommendation_input({'state': 'Kerala', 'district': 'Chennai', 'soil_type': 'red'})
+    assert error.startswith('Invalid district: Chennai is not a district of Kerala.')
+
+def test_autocomplete_endpoint_validates_limit():
+    client = main.app.test_client()
+    assert client.get('/autocomplete?q=koll&limit=abc').status_code == 400
+    results = client.get('/autocomplete?q=koll&state=Kerala').get_json()['results']
+    assert results[0]['district'] == 'Kollam'
@@ -0,0 +1,55 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+ROW = {'state': 'Kerala', 'district': 'Kollam', 'soil_type': 'laterite', 'season': 'kharif'}
+
+@pytest.mark.parametrize('value, expected', [
+    ('', 0), ('0', 0), ('false', 0), ('No', 0), ('true', 1), ('YES', 1), ('2', 2), (' 1 ', 1)
+])
+def test_parse_proxy_count(value, expected):
+    assert main.parse_proxy_count(value) == expected
+
+@pytest.mark.parametrize('value', ['maybe', '-1', '1.5'])
+def test_parse_proxy_count_rejects_garbage(value):
+    with pytest.raises(ValueError, match='RATE_LIMIT_TRUST_PROXY'):
+        main.parse_proxy_count(value)
+
+@pytest.mark.parametrize('proxies, forwarded_for, expected', [
+    (0, '9.9.9.9', '10.0.0.1'),
+    (1, None, '10.0.0.1'),
+    (1, 'spoofed, 9.9.9.9', '9.9.9.9'),
+    (2, 'spoofed, 1.1.1.1, 9.9.9.9', '1.1.1.1'),
+    (2, '9.9.9.9', '10.0.0.1'),
+])
+def test_client_identity_uses_trusted_hop(monkeypatch, proxies, forwarded_for, expected):
+    monkeypatch.setattr(main, 'RATE_LIMIT_TRUST_PROXY', proxies)
+    headers = {'X-Forwarded-For': forwarded_for} if forwarded_for else {}
+    with main.app.test_request_context('/', headers=headers, environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        assert main.get_client_identity()[0] == f'ip:{expected}'
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(main, 'client_rate_limiter', main.ClientRateLimiter(1000, None))
+    monkeypatch.setattr(main, 'RATE_LIMIT_PER_MINUTE', 60)
+    monkeypatch.setattr(main, 'RATE_LIMIT_BURST', 20)
+    monkeypatch.setattr(main, 'API_KEYS', {'secret'})
+    monkeypatch.setattr(main, 'get_recommendation_text', lambda *args: None)
+    return main.app.test_client()
+
+def test_anonymous_ai_batch_pays_per_row(limited):
+    assert limited.post('/recommend/batch', json={'rows': [ROW] * 25}).status_code == 403
+    response = limited.post('/recommend/batch', json={'rows': [ROW] * 15})
+    response.get_data()
+    assert response.status_code == 200
+    assert limited.post('/recommend/batch', json={'rows': [ROW] * 15}).status_code == 429
+
+def test_rule_only_and_keyed_batches_pay_per_request(limited):
+    for headers, body in [({}, {'rows': [ROW] * 25, 'ai': False}), ({'X-API-Key': 'secret'}, {'rows': [ROW] * 500})]:
+        response = limited.post('/recommend/batch', json=body, headers=headers)
+        response.get_data()
+        assert response.status_code == 200
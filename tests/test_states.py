@@ -0,0 +1,26 @@
+import os
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import pytest
+
+import main
+
+@pytest.mark.parametrize('encoding', ['gzip', 'identity'])
+def test_not_modified_carries_the_negotiated_etag(encoding):
+    client = main.app.test_client()
+    headers = {'Accept-Encoding': encoding}
+    first = client.get('/states', headers=headers)
+    assert first.status_code == 200
+    assert first.headers.get('Content-Encoding') == (None if encoding == 'identity' else encoding)
+    
+    revalidated = client.get('/states', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == first.headers['ETag']
+
+def test_etag_of_another_encoding_is_not_a_match():
+    client = main.app.test_client()
+    gzipped = client.get('/states', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/states', headers={'Accept-Encoding': 'identity', 'If-None-Match': gzipped.headers['ETag']})
+    assert plain.status_code == 200
+    assert plain.headers['ETag'] != gzipped.headers['ETag']
@@ -0,0 +1,45 @@
+import os
+from html.parser import HTMLParser
+
+os.environ.setdefault('GEMINI_API_KEY', 'offline-test')
+
+import main
+
+class FormParser(HTMLParser):
+    # Reads the recommendation form: `fields` is what a browser posts when the
+    # user leaves everything at its default, `options` the choices per select.
+    def __init__(self):
+        super().__init__()
+        self.fields = {}
+        self.options = {}
+        self.select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'input' and attrs.get('name'):
+            self.fields[attrs['name']] = attrs.get('value', '')
+        elif tag == 'select' and attrs.get('name'):
+            self.select = attrs['name']
+            self.options[self.select] = []
+        elif tag == 'option' and self.select:
+            self.options[self.select].append(attrs.get('value', ''))
+            self.fields.setdefault(self.select, attrs.get('value', ''))
+
+    def handle_endtag(self, tag):
+        if tag == 'select':
+            self.select = None
+
+def parse_form() -> FormParser:
+    parser = FormParser()
+    with open(os.path.join(main.FRONTEND_DIR, 'index.html'), encoding='utf-8') as f:
+        parser.feed(f.read())
+    return parser
+
+def test_ui_form_hits_warmed_key():
+    keys = {key for key, _, _ in main.enumerate_warm_combinations(['Tamil Nadu'], False)}
+    for irrigation in main.IRRIGATION_OPTIONS:
+        form = dict(parse_form().fields, state='Tamil Nadu', district='Chennai', soil_type='red', season='kharif', irrigation=irrigation)
+        assert main.build_cache_key(form, form['language']) in keys
+
+def test_irrigation_options_match_frontend():
+    assert parse_form().options['irrigation'] == main.IRRIGATION_OPTIONS